@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the tournament simulator.
+
+Suite (default): generates synthetic brackets of 64, 256, 1024 and 4096 teams
+(playoff_teams.csv / playoff_matchups.csv format, ELOs drawn around 1650 with
+a 100-point spread) and runs every engine on each:
+- numpy-hot, numpy-cold, python-hot, python-cold, exact (cold DP)
+Each case runs in a fresh process and reports simulations per second (full
+solves per second for exact), peak RSS and per-phase timings (load, simulate,
+record, results). Results can be saved
+as a JSON baseline; when compared against a baseline, the run fails (exit 1)
+if any case's throughput drops by more than --threshold percent.
+
+Micro-benchmark (--micro): cost per game of the ELO win-probability
+calculation, logistic formula (one pow call per game) vs the integer
+ELO-difference lookup table, for the scalar and array paths.
+
+Usage:
+    python scripts/benchmark_tournament_simulation.py [--sizes 64,256] [--save-baseline bench.json]
+    python scripts/benchmark_tournament_simulation.py --baseline bench.json [--threshold 10]
+    python scripts/benchmark_tournament_simulation.py --micro [--games 1000000]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import multiprocessing
+import platform
+import resource
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tournament_simulation import TournamentSimulator, win_probability, win_probabilities
+
+BRACKET_SIZES = (64, 256, 1024, 4096)
+ENGINES = ('numpy-hot', 'numpy-cold', 'python-hot', 'python-cold', 'exact')
+BASELINE_VERSION = 1
+
+# Simulations per case are sized so every case takes roughly a second or two
+NUMPY_BUDGET = 2000000
+PYTHON_BUDGET = 50000
+EXACT_BUDGET = 2000000  # exact solves cost ~teams^2
+NUMPY_BATCH_SIZE = 10000
+
+
+def logistic_win_probability(elo_a, elo_b):
+    """The per-game formula the lookup table replaces."""
+    return 1.0 / (1.0 + math.pow(10, (elo_b - elo_a) / 400.0))
+
+
+def time_per_game(fn, games, repeats=5):
+    """Best-of-repeats wall time of fn(), in nanoseconds per game."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best / games * 1e9
+
+
+def sample_hot_elos(games, seed=0):
+    """Integer ELO pairs like those seen mid-series in hot mode."""
+    rng = np.random.default_rng(seed)
+    elo_a = rng.normal(1600, 120, games).round()
+    elo_b = rng.normal(1600, 120, games).round()
+    return elo_a, elo_b
+
+
+def benchmark_win_probability(games):
+    elo_a, elo_b = sample_hot_elos(games)
+    pairs = list(zip(elo_a.tolist(), elo_b.tolist()))
+
+    def scalar_formula():
+        for a, b in pairs:
+            logistic_win_probability(a, b)
+
+    def scalar_table():
+        for a, b in pairs:
+            win_probability(a, b)
+
+    def array_formula():
+        1.0 / (1.0 + np.power(10.0, (elo_b - elo_a) / 400.0))
+        1.0 / (1.0 + np.power(10.0, (elo_a - elo_b) / 400.0))
+
+    def array_table():
+        win_probabilities(elo_a, elo_b)
+
+    return [
+        ('scalar (python engine)', time_per_game(scalar_formula, games), time_per_game(scalar_table, games)),
+        ('array (numpy engine)', time_per_game(array_formula, games), time_per_game(array_table, games)),
+    ]
+
+
+def make_bracket(num_teams, seed=0):
+    """
+    Build a full single-elimination bracket of num_teams (a power of two) in
+    the playoff_teams / playoff_matchups CSV layout. Returns (teams_df, matchups_df).
+    """
+    rng = np.random.default_rng(seed)
+    team_ids = [str(uuid.UUID(int=int(x))) for x in rng.integers(0, 2**63, num_teams)]
+    teams_df = pd.DataFrame({
+        'team_id': team_ids,
+        'username': [f"user{u}" for u in rng.integers(0, max(1, num_teams // 3), num_teams)],
+        'elo': rng.normal(1650, 100, num_teams).round(2),
+    })
+    
+    rows = []
+    next_id = 1
+    round_ids = []
+    matchups_in_round = num_teams // 2
+    round_num = 1
+    while matchups_in_round >= 1:
+        ids = list(range(next_id, next_id + matchups_in_round))
+        for position, matchup_id in enumerate(ids):
+            team1, team2 = (team_ids[2 * position], team_ids[2 * position + 1]) if round_num == 1 else (None, None)
+            rows.append([matchup_id, 'BENCH', round_num, position + 1, team1, team2, None, 'pending', 4,
+                         None, None, None, None])
+        round_ids.append(ids)
+        next_id += matchups_in_round
+        matchups_in_round //= 2
+        round_num += 1
+    
+    matchups_df = pd.DataFrame(rows, columns=['id', 'tournament_id', 'round_number', 'bracket_position',
+                                              'team1_id', 'team2_id', 'winner_id', 'status', 'votes_needed',
+                                              'created_at', 'completed_at', 'parent_matchup_id', 'parent_position'])
+    parent_of = {}
+    for ids, parents in zip(round_ids, round_ids[1:]):
+        for position, matchup_id in enumerate(ids):
+            parent_of[matchup_id] = (parents[position // 2], position % 2 + 1)
+    matchups_df['parent_matchup_id'] = matchups_df['id'].map(lambda i: parent_of.get(i, (None, None))[0])
+    matchups_df['parent_position'] = matchups_df['id'].map(lambda i: parent_of.get(i, (None, None))[1])
+    return teams_df, matchups_df
+
+
+def write_bracket(num_teams, directory, seed=0):
+    """Write a synthetic bracket as CSVs. Returns (teams_file, matchups_file)."""
+    teams_df, matchups_df = make_bracket(num_teams, seed)
+    teams_file = Path(directory) / f"playoff_teams_{num_teams}.csv"
+    matchups_file = Path(directory) / f"playoff_matchups_{num_teams}.csv"
+    teams_df.to_csv(teams_file, index=False)
+    matchups_df.to_csv(matchups_file, index=False)
+    return teams_file, matchups_file
+
+
+def simulations_for(engine, num_teams, scale=1.0):
+    """Number of tournaments to simulate for one case (for exact: number of full solves)."""
+    if engine == 'exact':
+        return max(1, int(EXACT_BUDGET * scale) // num_teams ** 2)
+    budget = NUMPY_BUDGET if engine.startswith('numpy') else PYTHON_BUDGET
+    return max(5, int(budget * scale) // num_teams)
+
+
+def run_case(teams_file, matchups_file, engine, num_simulations, seed=0):
+    """
+    Run one benchmark case and return its measurements. Meant to run in a
+    fresh process so peak RSS belongs to this case alone.
+    """
+    phases = {}
+    
+    def timed(phase, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        phases[phase] = phases.get(phase, 0.0) + time.perf_counter() - start
+        return result
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulator = timed('load', TournamentSimulator, str(teams_file), str(matchups_file))
+        if engine == 'exact':
+            for _ in range(num_simulations):
+                timed('simulate', simulator.compute_exact_odds)
+        elif engine.startswith('numpy'):
+            simulate = simulator.simulate_tournaments_hot if engine == 'numpy-hot' else simulator.simulate_tournaments_cold
+            rng = np.random.default_rng(seed)
+            remaining = num_simulations
+            while remaining > 0:
+                n = min(remaining, NUMPY_BATCH_SIZE)
+                winners = timed('simulate', simulate, n, rng)
+                timed('record', simulator.record_batch_results, winners)
+                remaining -= n
+        else:
+            # The python engine records as it goes, so simulate includes record
+            hot_simulation = engine == 'python-hot'
+            timed('simulate', simulator.run_block, num_simulations, np.random.SeedSequence(seed),
+                  hot_simulation, 'python')
+        timed('results', simulator.build_results_frame)
+    
+    run_seconds = phases['simulate'] + phases.get('record', 0.0)
+    return {
+        'teams': len(simulator.team_ids),
+        'engine': engine,
+        'simulations': num_simulations,
+        'simulations_per_second': num_simulations / run_seconds,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+        'phases': phases,
+    }
+
+
+def run_suite(sizes, engines, scale=1.0, seed=0, inputs_dir=None):
+    """Run every (size, engine) case. Returns {case key: measurements}."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(inputs_dir or tmp)
+        directory.mkdir(parents=True, exist_ok=True)
+        for num_teams in sizes:
+            teams_file, matchups_file = write_bracket(num_teams, directory, seed)
+            for engine in engines:
+                num_simulations = simulations_for(engine, num_teams, scale)
+                # A fresh spawned process per case keeps peak RSS per case
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+                    result = pool.submit(run_case, teams_file, matchups_file, engine, num_simulations, seed).result()
+                key = f"{num_teams}/{engine}"
+                results[key] = result
+                print_case(key, result)
+    return results
+
+
+def print_case(key, result):
+    phases = ' '.join(f"{phase}={seconds * 1000:.1f}ms" for phase, seconds in result['phases'].items())
+    print(f"{key:<18} {result['simulations']:>8,} sims {result['simulations_per_second']:>12,.1f}/s "
+          f"{result['peak_rss_mb']:>8.1f} MB  {phases}")
+
+
+def compare_to_baseline(results, baseline, threshold):
+    """Print throughput changes against a baseline. Returns the regressed case keys."""
+    regressions = []
+    print(f"\n{'Case':<18} {'Baseline/s':>14} {'Current/s':>14} {'Change':>9}")
+    print("-" * 58)
+    for key, result in results.items():
+        base = baseline['cases'].get(key)
+        if base is None:
+            print(f"{key:<18} {'-':>14} {result['simulations_per_second']:>14,.1f} {'new':>9}")
+            continue
+        change = (result['simulations_per_second'] / base['simulations_per_second'] - 1.0) * 100.0
+        flag = ''
+        if change < -threshold:
+            regressions.append(key)
+            flag = '  REGRESSION'
+        print(f"{key:<18} {base['simulations_per_second']:>14,.1f} {result['simulations_per_second']:>14,.1f} "
+              f"{change:>+8.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tournament simulation benchmarks')
+    parser.add_argument('--sizes', type=str, default=','.join(str(n) for n in BRACKET_SIZES),
+                       help='Bracket sizes in teams, powers of two (default: 64,256,1024,4096)')
+    parser.add_argument('--engines', type=str, default=','.join(ENGINES),
+                       help=f"Engines to run (default: {','.join(ENGINES)})")
+    parser.add_argument('--scale', type=float, default=1.0,
+                       help='Multiplier on the number of simulations per case (default: 1.0)')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='Seed for the synthetic brackets and the simulations (default: 0)')
+    parser.add_argument('--inputs-dir', type=str,
+                       help='Keep the generated playoff_teams/playoff_matchups CSVs in this directory')
+    parser.add_argument('--save-baseline', type=str, metavar='JSON',
+                       help='Write the results as a JSON baseline')
+    parser.add_argument('--baseline', type=str, metavar='JSON',
+                       help='Compare throughput against this baseline and fail on regressions')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                       help='Allowed throughput drop against the baseline, in percent (default: 10)')
+    parser.add_argument('--micro', action='store_true',
+                       help='Run the win-probability micro-benchmark instead of the suite')
+    parser.add_argument('--games', type=int, default=1000000,
+                       help='Games per micro-benchmark measurement (default: 1000000)')
+    args = parser.parse_args()
+
+    if args.micro:
+        print(f"Win probability per game ({args.games:,} games, best of 5):")
+        print(f"{'Path':<24} {'Formula':>12} {'Table':>12} {'Speedup':>9}")
+        print("-" * 60)
+        for name, before, after in benchmark_win_probability(args.games):
+            print(f"{name:<24} {before:>9.1f} ns {after:>9.1f} ns {before / after:>8.2f}x")
+        return 0
+
+    sizes = [int(n) for n in args.sizes.split(',') if n.strip()]
+    engines = [e.strip() for e in args.engines.split(',') if e.strip()]
+    unknown = [e for e in engines if e not in ENGINES]
+    if unknown:
+        sys.exit(f"Unknown engines: {', '.join(unknown)} (choose from {', '.join(ENGINES)})")
+    if any(n < 2 or n & (n - 1) for n in sizes):
+        sys.exit("Bracket sizes must be powers of two")
+
+    print(f"Benchmarking {len(sizes) * len(engines)} cases (scale {args.scale:g}, seed {args.seed})")
+    results = run_suite(sizes, engines, args.scale, args.seed, args.inputs_dir)
+
+    if args.save_baseline:
+        baseline = {
+            'version': BASELINE_VERSION,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'cases': results,
+        }
+        Path(args.save_baseline).write_text(json.dumps(baseline, indent=2))
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if baseline.get('version') != BASELINE_VERSION:
+            sys.exit(f"Unsupported baseline version {baseline.get('version')} in {args.baseline}")
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than baseline by more than {args.threshold:g}%: "
+                  f"{', '.join(regressions)}")
+            return 1
+        print(f"\nNo throughput regressions beyond {args.threshold:g}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,6 +13,7 @@ Features:
 - Same weighted voting system as Bradley-Terry model
 - Per-tournament rating isolation
 - Chronological processing of matchups for accurate evolution
+- Matches grouped once per run and replayed over dense integer team indices
 
 Usage:
     python scripts/elo_team_ratings.py [DB_PATH] [OUTPUT_CSV]
@@ -30,7 +31,6 @@ import os
 import sqlite3
 from pathlib import Path
 import math
-from collections import defaultdict
 from datetime import datetime
 
 import numpy as np
@@ -40,21 +40,27 @@ import pandas as pd
 STARTING_ELO = 1500.0
 BASE_K_FACTOR = 128.0
 
-def calculate_vote_weight(voter_id, winner_user_id, loser_user_id):
-    """Calculate vote weight using same logic as Bradley-Terry model."""
-    if pd.isna(voter_id):
-        return 1.0
-    
-    voter_id = str(voter_id)
-    winner_user_id = str(winner_user_id) if pd.notna(winner_user_id) else None
-    loser_user_id = str(loser_user_id) if pd.notna(loser_user_id) else None
+def id_strings(ids):
+    """str() of every id in a column, computed once per distinct value; missing ids become None."""
+    codes, uniques = pd.factorize(ids)
+    strings = np.full(len(codes), None, dtype=object)
+    present = codes >= 0
+    strings[present] = np.asarray(uniques.astype(str), dtype=object)[codes[present]]
+    return strings
+
+def calculate_vote_weights(voter_ids, winner_user_ids, loser_user_ids):
+    """
+    Calculate vote weights for whole columns at once, using same logic as
+    Bradley-Terry model. Ids are compared as strings; a missing voter is a
+    neutral vote and a missing user id never matches.
+    """
+    voters = id_strings(voter_ids)
+    has_voter = voter_ids.notna().to_numpy()
+    self_votes = has_voter & winner_user_ids.notna().to_numpy() & (voters == id_strings(winner_user_ids))
+    own_team_losses = has_voter & loser_user_ids.notna().to_numpy() & (voters == id_strings(loser_user_ids))
     
-    if voter_id == winner_user_id:
-        return 0.5  # Self-votes count as half
-    elif voter_id == loser_user_id:
-        return 1.5  # Voting against own team gets extra credit
-    else:
-        return 1.0  # Neutral votes get normal weight
+    # Self-votes count as half, voting against own team gets extra credit, neutral votes get normal weight
+    return np.select([self_votes, own_team_losses], [0.5, 1.5], default=1.0)
 
 def expected_score(rating_a, rating_b):
     """Calculate expected score for team A against team B using logistic function."""
@@ -81,6 +87,41 @@ def adaptive_k_factor(base_k, vote_weight, matches_played):
     k = base_k * weight_multiplier * experience_factor
     return k
 
+def replay_matches(winners, losers, vote_weights, num_teams):
+    """
+    Replay one tournament's matches in chronological order. winners and losers
+    are dense team indices (0..num_teams-1) and vote_weights the matching
+    weights. The loop runs over plain Python lists rather than DataFrame rows.
+    
+    Returns:
+        (elo_ratings, matches_played, wins, losses) NumPy arrays by team index
+    """
+    elos = [STARTING_ELO] * num_teams
+    matches_played = [0] * num_teams
+    wins = [0.0] * num_teams
+    losses = [0.0] * num_teams
+    
+    for winner, loser, vote_weight in zip(winners.tolist(), losers.tolist(), vote_weights.tolist()):
+        winner_elo = elos[winner]
+        loser_elo = elos[loser]
+        
+        winner_expected = expected_score(winner_elo, loser_elo)
+        loser_expected = 1.0 - winner_expected
+        
+        winner_k = adaptive_k_factor(BASE_K_FACTOR, vote_weight, matches_played[winner])
+        loser_k = adaptive_k_factor(BASE_K_FACTOR, vote_weight, matches_played[loser])
+        
+        # Winner gets score of 1, loser gets score of 0
+        elos[winner] = winner_elo + winner_k * (1.0 - winner_expected)
+        elos[loser] = loser_elo + loser_k * (0.0 - loser_expected)
+        
+        matches_played[winner] += 1
+        matches_played[loser] += 1
+        wins[winner] += vote_weight
+        losses[loser] += vote_weight
+    
+    return np.array(elos), np.array(matches_played, dtype=np.int64), np.array(wins), np.array(losses)
+
 def elo_to_madden(elo_rating, min_elo, max_elo):
     """
     Convert ELO rating to Madden-style 0-99 scale.
@@ -145,6 +186,15 @@ def main():
         ORDER BY vm.created_at ASC
     """, con)
     
+    # Group matches by tournament once (each group stays in chronological order)
+    # and weigh every vote up front
+    match_groups = matches_df.groupby("tournament").indices
+    self_matches = (matches_df['winner_id'] == matches_df['loser_id']).to_numpy()
+    vote_weights = calculate_vote_weights(matches_df['voter_id'], matches_df['winner_user_id'],
+                                          matches_df['loser_user_id'])
+    winner_ids = matches_df['winner_id'].to_numpy()
+    loser_ids = matches_df['loser_id'].to_numpy()
+    
     # Process each tournament separately
     results = []
     tournament_groups = teams_df.groupby("tournament")
@@ -152,76 +202,40 @@ def main():
     for tournament, team_group in tournament_groups:
         print(f"Processing tournament: {tournament}")
         
-        # Initialize ELO ratings for all teams in tournament
-        team_elos = {}
-        team_matches_played = defaultdict(int)
-        team_wins = defaultdict(float)
-        team_losses = defaultdict(float)
+        # Dense integer indices for the teams in this tournament
+        team_index = pd.Index(team_group['id'])
         
-        for _, team in team_group.iterrows():
-            team_elos[team['id']] = STARTING_ELO
+        # Get matches for this tournament, skipping self-matches
+        rows = match_groups.get(tournament, np.empty(0, dtype=np.int64))
+        rows = rows[~self_matches[rows]]
         
-        # Get matches for this tournament
-        tournament_matches = matches_df[matches_df['tournament'] == tournament].copy()
+        winners = team_index.get_indexer(winner_ids[rows])
+        losers = team_index.get_indexer(loser_ids[rows])
+        # get_indexer marks unknown ids with -1, which would silently index the last team
+        if (winners < 0).any() or (losers < 0).any():
+            raise ValueError(f"Matches reference teams outside tournament {tournament}")
         
-        # Process matches chronologically
-        for _, match in tournament_matches.iterrows():
-            winner_id = match['winner_id']
-            loser_id = match['loser_id']
-            voter_id = match['voter_id']
-            winner_user_id = match['winner_user_id']
-            loser_user_id = match['loser_user_id']
-            
-            # Skip self-matches
-            if winner_id == loser_id:
-                continue
-            
-            # Calculate vote weight
-            vote_weight = calculate_vote_weight(voter_id, winner_user_id, loser_user_id)
-            
-            # Get current ratings
-            winner_elo = team_elos[winner_id]
-            loser_elo = team_elos[loser_id]
-            
-            # Calculate expected scores
-            winner_expected = expected_score(winner_elo, loser_elo)
-            loser_expected = 1.0 - winner_expected
-            
-            # Calculate adaptive K-factors
-            winner_k = adaptive_k_factor(BASE_K_FACTOR, vote_weight, team_matches_played[winner_id])
-            loser_k = adaptive_k_factor(BASE_K_FACTOR, vote_weight, team_matches_played[loser_id])
-            
-            # Update ELO ratings
-            # Winner gets score of 1, loser gets score of 0
-            winner_new_elo = winner_elo + winner_k * (1.0 - winner_expected)
-            loser_new_elo = loser_elo + loser_k * (0.0 - loser_expected)
-            
-            team_elos[winner_id] = winner_new_elo
-            team_elos[loser_id] = loser_new_elo
-            
-            # Update match counts and win/loss records
-            team_matches_played[winner_id] += 1
-            team_matches_played[loser_id] += 1
-            team_wins[winner_id] += vote_weight
-            team_losses[loser_id] += vote_weight
+        elo_ratings, matches_played, wins, losses = replay_matches(
+            winners,
+            losers,
+            vote_weights[rows],
+            len(team_index)
+        )
         
         # Collect results for this tournament
-        for team_id, elo_rating in team_elos.items():
-            team_info = team_group[team_group['id'] == team_id].iloc[0]
-            
-            results.append({
-                'team_id': team_id,
-                'tournament': tournament,
-                'username': team_info['username'],
-                'elo_rating': float(elo_rating),
-                'madden': 99.0,
-                'wins': float(team_wins[team_id]),
-                'losses': float(team_losses[team_id]),
-                'matches_played': team_matches_played[team_id]
-            })
+        results.append(pd.DataFrame({
+            'team_id': team_group['id'].to_numpy(),
+            'tournament': tournament,
+            'username': team_group['username'].to_numpy(),
+            'elo_rating': elo_ratings,
+            'madden': 99.0,
+            'wins': wins,
+            'losses': losses,
+            'matches_played': matches_played
+        }))
     
     # Create results DataFrame
-    results_df = pd.DataFrame(results)
+    results_df = pd.concat(results, ignore_index=True) if results else pd.DataFrame()
     
     if results_df.empty:
         print("No results to export.")
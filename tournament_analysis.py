@@ -4,15 +4,19 @@ Tournament Analysis and Visualization
 
 Analyzes the tournament simulation results and creates visualizations.
 Reads from the tournament_championship_odds.csv file created by tournament_simulation.py
+(or a .parquet / .arrow results file written with its --export option)
 
 Features:
 - Championship odds comparison
 - ELO rating vs tournament success correlation
 - Round-by-round advancement analysis
-- User performance summary (for users with multiple teams)
+- User performance summary (for users with multiple teams), from the joint
+  per-user odds written by tournament_simulation.py --export-users when given
+- Dark horse odds from importance sampling when the results were produced
+  with tournament_simulation.py --long-shots
 
 Usage:
-    python tournament_analysis.py [--csv-file tournament_championship_odds.csv]
+    python tournament_analysis.py [--csv-file tournament_championship_odds.csv] [--users-file tournament_user_odds.csv]
 """
 
 import pandas as pd
@@ -24,14 +28,35 @@ import argparse
 from pathlib import Path
 
 def load_tournament_data(csv_file='tournament_championship_odds.csv'):
-    """Load tournament simulation results from CSV."""
+    """
+    Load tournament simulation results from CSV, Parquet or Arrow IPC.
+    Arrow IPC (.arrow/.feather) files are memory-mapped rather than parsed, and
+    their numeric columns stay read-only views of the mapping (one block per
+    column, so pandas does not consolidate them into a copy).
+    """
     if not Path(csv_file).exists():
         raise FileNotFoundError(f"Results file '{csv_file}' not found. Run tournament_simulation.py first.")
     
-    df = pd.read_csv(csv_file)
+    suffix = Path(csv_file).suffix.lower()
+    if suffix in ('.arrow', '.feather'):
+        import pyarrow as pa
+        with pa.memory_map(csv_file) as source:
+            df = pa.ipc.open_file(source).read_all().to_pandas(split_blocks=True, self_destruct=True)
+    elif suffix == '.parquet':
+        df = pd.read_parquet(csv_file, memory_map=True)
+    else:
+        df = pd.read_csv(csv_file)
     print(f"Loaded {len(df)} teams from {csv_file}")
     return df
 
+def load_user_data(users_file):
+    """Load the per-user joint odds written by tournament_simulation.py --export-users."""
+    if not Path(users_file).exists():
+        raise FileNotFoundError(f"User results file '{users_file}' not found. Run tournament_simulation.py --export-users first.")
+    user_df = pd.read_csv(users_file)
+    print(f"Loaded {len(user_df)} users from {users_file}")
+    return user_df
+
 def analyze_elo_vs_success(df):
     """Analyze correlation between ELO rating and tournament success."""
     print("\n" + "="*60)
@@ -60,12 +85,37 @@ def analyze_elo_vs_success(df):
             range_name = f"{min_elo}-{max_elo}" if max_elo < 2000 else f"{min_elo}+"
             print(f"{range_name:<15} {len(range_teams):<6} {avg_champ_prob:<12.3f} {total_champ_prob:<15.1f}")
 
-def analyze_user_performance(df):
-    """Analyze performance for users with multiple teams."""
+def analyze_user_performance(df, user_df=None):
+    """
+    Analyze performance for users with multiple teams.
+    With user_df (from --export-users) the odds are joint: the probability that
+    any of the user's teams gets there, counted once per simulated tournament.
+    Without it, team odds are summed, which overstates every round before the
+    final for users whose teams can knock each other out.
+    """
     print("\n" + "="*60)
     print("USER PERFORMANCE ANALYSIS (Multiple Teams)")
     print("="*60)
     
+    if user_df is not None:
+        # round_{r}_prob is winning a round-r matchup: the Final Four are the winners two rounds before the final
+        last_round = max(int(col.split('_')[1]) for col in user_df.columns if col.startswith('round_') and col.endswith('_prob'))
+        final4_col, sweet16_col = f'round_{last_round - 2}_prob', f'round_{last_round - 4}_prob'
+        multi_team_users = user_df[user_df['team_count'] > 1].sort_values('championship_probability', ascending=False)
+        print(f"Users with multiple teams: {len(multi_team_users)}")
+        print(f"\nTop users by championship probability (any of their teams):")
+        print(f"{'Username':<20} {'Teams':<6} {'Champ %':<10} {'Final Four %':<14} {'Sweet 16 %':<12} {'Max ELO':<10}")
+        print("-" * 76)
+        
+        for _, stats in multi_team_users.head(15).iterrows():
+            final4_pct = stats.get(final4_col, float('nan')) * 100
+            sweet16_pct = stats.get(sweet16_col, float('nan')) * 100
+            print(f"{stats['username']:<20} {int(stats['team_count']):<6} {stats['championship_probability']*100:<10.2f} "
+                  f"{final4_pct:<14.2f} {sweet16_pct:<12.2f} {stats['max_elo']:<10.0f}")
+        return
+    
+    print("(Summed team odds; pass --users-file for joint per-user odds)")
+    
     # Group by username
     user_stats = df.groupby('username').agg({
         'team_id': 'count',
@@ -203,7 +253,11 @@ def print_key_insights(df):
     
     top_team = df.loc[df['championship_probability'].idxmax()]
     highest_elo = df.loc[df['elo'].idxmax()]
-    biggest_upset_potential = df.loc[(df['elo'] < 1650) & (df['championship_probability'] > 0)]['championship_probability'].max()
+    # Long shots' odds from --long-shots importance sampling are far less noisy than plain counts
+    long_shot_odds = df['championship_probability']
+    if 'championship_probability_is' in df.columns:
+        long_shot_odds = df['championship_probability_is'].fillna(long_shot_odds)
+    biggest_upset_potential = long_shot_odds[(df['elo'] < 1650) & (long_shot_odds > 0)].max()
     
     print(f"🏆 Championship Favorite: {top_team['username']} ({top_team['championship_probability']*100:.2f}% chance)")
     print(f"⭐ Highest ELO: {highest_elo['username']} ({highest_elo['elo']:.1f} ELO)")
@@ -222,7 +276,11 @@ def print_key_insights(df):
 def main():
     parser = argparse.ArgumentParser(description='Tournament Analysis and Visualization')
     parser.add_argument('--csv-file', default='tournament_championship_odds.csv',
-                       help='CSV file with tournament results (default: tournament_championship_odds.csv)')
+                       help='Results file from tournament_simulation.py: .csv, .parquet or .arrow '
+                            '(default: tournament_championship_odds.csv)')
+    parser.add_argument('--users-file', default=None,
+                       help='Per-user joint odds from tournament_simulation.py --export-users '
+                            '(default: sum the per-team odds)')
     parser.add_argument('--no-plots', action='store_true',
                        help='Skip creating visualization plots')
     
@@ -231,10 +289,11 @@ def main():
     try:
         # Load data
         df = load_tournament_data(args.csv_file)
+        user_df = load_user_data(args.users_file) if args.users_file else None
         
         # Run analyses
         analyze_elo_vs_success(df)
-        analyze_user_performance(df)
+        analyze_user_performance(df, user_df)
         analyze_round_advancement(df)
         print_key_insights(df)
         
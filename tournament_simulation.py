@@ -8,16 +8,46 @@ Uses Monte Carlo simulation to estimate the probability of each team winning the
 Features:
 - Loads team ELO ratings from playoff_teams.csv
 - Loads bracket structure from playoff_matchups.csv  
+  (or reads both straight from the app database with --tournament ID)
 - ELO-based matchup probability calculations
 - Monte Carlo simulation with configurable iterations
+- Batched NumPy engines that simulate many hot or cold tournaments per round at once
+- Exact cold-mode odds by dynamic programming over the bracket (--exact)
+- Multi-process runs with per-block seed streams; seeded results do not depend on --workers
+- Confidence intervals on every sampled probability, and adaptive stopping (--precision)
+- K-factor / hot-cold parameter sweeps on common random numbers (--sweep-k)
+- Live brackets: completed matchups are locked in, exact odds refresh incrementally (--watch)
+- Per-phase / per-round profiling reports (--profile) and cProfile capture (--cprofile)
+- Checkpoint/resume of long runs, and merging result shards across runs (--checkpoint, --merge-shards)
+- Joint per-user odds: any of a user's teams reaching each round (--export-users)
+- Pairwise meeting odds ("A faces B in round R"), exact or counted sparsely per team (--meetings)
+- Bit-packed, memory-mapped store of every sampled bracket for later analysis (--bracket-store)
+- Bracket-pool (pick'em) scoring of every entry against every sampled bracket (--pickem)
+- Resident odds service over localhost HTTP or a Unix socket, reloading changed inputs (--serve)
+- Importance-sampled championship odds for long shots, tilted toward each underdog (--long-shots)
+- Rating uncertainty: starting ELOs drawn per simulation, spread by matches played (--rating-uncertainty)
+- Every active tournament in the database in one run on a shared worker pool (--all-active)
 - Championship odds and detailed statistics output
 - Regional analysis and round-by-round probabilities
 
 Usage:
-    python tournament_simulation.py [--simulations 10000] [--verbose]
+    python tournament_simulation.py [--simulations 10000] [--verbose] [--engine numpy|python]
+    python tournament_simulation.py --exact
+    python tournament_simulation.py --simulations 1000000 --workers 32 --seed 42
+    python tournament_simulation.py --precision 0.1 --top-n 20
+    python tournament_simulation.py --sweep-k 64,128,256 --sweep-modes hot,cold
+    python tournament_simulation.py --exact --watch 30
+    python tournament_simulation.py -s 1000000 --seed 1 --checkpoint run1.json
+    python tournament_simulation.py --merge-shards run1.json run2.json --export-csv odds.csv
+    python tournament_simulation.py --exact --serve unix:/tmp/odds.sock
+    python tournament_simulation.py -s 1000000 --seed 1 --bracket-store brackets.bin
+    python tournament_simulation.py --pickem entries.csv --pickem-brackets brackets.bin
+    python tournament_simulation.py -s 100000 --long-shots 1650 --export-csv odds.csv
+    python tournament_simulation.py -s 100000 --rating-uncertainty
+    python tournament_simulation.py --db teams.db --all-active --workers 8 --batch-output odds/{tournament_id}.csv
 
 Requires:
-    - playoff_teams.csv: team_id, username, elo
+    - playoff_teams.csv: team_id, username, elo (optionally matches_played, or wins and losses)
     - playoff_matchups.csv: tournament bracket structure
 """
 
@@ -25,51 +55,846 @@ import pandas as pd
 import numpy as np
 import random
 import math
-from collections import defaultdict, Counter
+import bisect
+from collections import defaultdict, Counter, OrderedDict
+from contextlib import contextmanager
 import argparse
+import cProfile
+import hashlib
+import ipaddress
+import json
+import os
+import socketserver
+import sqlite3
+import struct
 import sys
+import time
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from statistics import NormalDist
+from urllib.parse import parse_qs, urlsplit
+
+# Win probabilities indexed by integer ELO difference (team A minus team B, offset
+# by ELO_TABLE_RANGE). Hot-mode ELOs are rounded after every game, so nearly every
+# game is a table lookup; other differences fall back to the logistic formula.
+# np.power and math.pow can differ in the last bit, so the array and scalar paths
+# each get a table built with the function they replace and stay bit-for-bit identical.
+ELO_TABLE_RANGE = 2000
+WIN_PROBABILITY_TABLE = 1.0 / (1.0 + np.power(10.0, -np.arange(-ELO_TABLE_RANGE, ELO_TABLE_RANGE + 1) / 400.0))
+_LOSS_PROBABILITY_TABLE = WIN_PROBABILITY_TABLE[::-1].copy()
+# Keyed by difference; integral floats hash like ints, so 12.0 and 12 find the same entry
+_WIN_PROBABILITY_BY_DIFF = {diff: 1.0 / (1.0 + math.pow(10, -diff / 400.0))
+                            for diff in range(-ELO_TABLE_RANGE, ELO_TABLE_RANGE + 1)}
+
+# Standard error of an ELO rating backed by a single even match: one over the square
+# root of the logistic model's Fisher information at p = 0.5. n matches shrink it by sqrt(n).
+RATING_SD_PER_MATCH = 800.0 / math.log(10.0)
+
+
+def win_probability(elo_a, elo_b):
+    """P(A beats B) = 1 / (1 + 10^((elo_b - elo_a)/400)), from the table when the difference is an integer."""
+    prob = _WIN_PROBABILITY_BY_DIFF.get(elo_a - elo_b)
+    if prob is None:
+        prob = 1.0 / (1.0 + math.pow(10, (elo_b - elo_a) / 400.0))
+    return prob
+
+
+def shift_exact_delta(delta):
+    """
+    True if round(elo + delta) - elo is the same for all integer ELOs of one
+    parity: delta ends in an exact .5 (rounded half to even, so by parity) or
+    its fraction is far enough from .5 that float rounding of the sum cannot
+    tip it either way.
+    """
+    fraction = delta - math.floor(delta)
+    return fraction == 0.5 or abs(fraction - 0.5) > 2.0 ** -20
+
+
+def win_probabilities(elo_a, elo_b):
+    """Array version of win_probability. Returns (P(A beats B), P(B beats A))."""
+    diff = elo_a - elo_b
+    index = diff.astype(np.int64)
+    index += ELO_TABLE_RANGE
+    np.clip(index, 0, 2 * ELO_TABLE_RANGE, out=index)
+    prob_a = WIN_PROBABILITY_TABLE.take(index)
+    prob_b = _LOSS_PROBABILITY_TABLE.take(index)
+    
+    # Fractional or out-of-range differences don't round-trip through the index
+    off_table = (index - ELO_TABLE_RANGE) != diff
+    if off_table.any():
+        prob_a[off_table] = 1.0 / (1.0 + np.power(10.0, -diff[off_table] / 400.0))
+        prob_b[off_table] = 1.0 / (1.0 + np.power(10.0, diff[off_table] / 400.0))
+    return prob_a, prob_b
+
+
+class SeriesOutcomes:
+    """
+    Exact outcome distribution of one best-of-7 series from a pair of starting ELOs.
+    Each outcome is (team1_won, games, final_team1_elo, final_team2_elo) with its probability.
+    """
+    
+    def __init__(self, outcomes, shift_exact=True):
+        self.shift_exact = shift_exact
+        self.team1_won = np.array([o[0] for o in outcomes], dtype=bool)
+        self.games = np.array([o[1] for o in outcomes], dtype=np.int64)
+        self.final_team1_elo = np.array([o[2] for o in outcomes], dtype=np.float64)
+        self.final_team2_elo = np.array([o[3] for o in outcomes], dtype=np.float64)
+        self.probabilities = np.array([o[4] for o in outcomes], dtype=np.float64)
+        self.cumulative = np.cumsum(self.probabilities)
+        self.cumulative /= self.cumulative[-1]
+        self.team1_win_probability = float(self.probabilities[self.team1_won].sum())
+        
+        # Plain-python copies for the scalar sampling path
+        self._cumulative = self.cumulative.tolist()
+        self._outcomes = [(bool(o[0]), int(o[1]), float(o[2]), float(o[3])) for o in outcomes]
+    
+    def sample(self, u):
+        """
+        Return the outcome (team1_won, games, final_team1_elo, final_team2_elo)
+        selected by a uniform draw u in [0, 1).
+        """
+        return self._outcomes[min(bisect.bisect_right(self._cumulative, u), len(self._outcomes) - 1)]
+
+
+class SeriesOutcomeCache:
+    """
+    Bounded LRU cache of SeriesOutcomes keyed by (elo1, elo2, k_factor).
+    Hot-mode ELOs are rounded to integers after every game, and for integer
+    ELOs every update is a whole-number shift that depends only on the rating
+    gap and, for an exact .5 tie (rounded half to even), the parity. So integer
+    pairs are stored once per gap and parity (team2 moved to 0 or 1) and shifted
+    back on lookup, which keeps the hit rate high across simulations. Tables
+    built from an update within float rounding of a .5 tie are not shiftable;
+    those pairs get a table of their own.
+    """
+    
+    def __init__(self, build_outcomes, maxsize=100000):
+        self.build_outcomes = build_outcomes
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def normalize(elo1, elo2):
+        """Return the (even) ELO shift that maps (elo1, elo2) onto its cache key."""
+        if float(elo1).is_integer() and float(elo2).is_integer():
+            return elo2 - elo2 % 2
+        return 0.0
+    
+    def lookup(self, elo1, elo2, k_factor):
+        """Return (outcomes, shift); final ELOs are outcomes' final ELOs plus shift."""
+        shift = self.normalize(elo1, elo2)
+        outcomes = self.get(elo1 - shift, elo2 - shift, k_factor)
+        if shift and not outcomes.shift_exact:
+            shift = 0.0
+            outcomes = self.get(elo1, elo2, k_factor)
+        return outcomes, shift
+    
+    def get(self, elo1, elo2, k_factor):
+        key = (elo1, elo2, k_factor)
+        outcomes = self.entries.get(key)
+        if outcomes is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return outcomes
+        
+        self.misses += 1
+        outcomes = self.build_outcomes(elo1, elo2)
+        self.entries[key] = outcomes
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return outcomes
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+class PhaseProfiler:
+    """
+    Wall time, CPU time and allocated-block deltas per named phase, plus
+    per-round timings and series/game counts from the simulation engines.
+    A disabled profiler does nothing, so the engines call it unconditionally.
+    Reports from worker processes are folded in with merge().
+    """
+    
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.phases = {}
+        self.rounds = {}
+        self.counters = Counter()
+    
+    @staticmethod
+    def _snapshot():
+        return time.perf_counter(), time.process_time(), sys.getallocatedblocks()
+    
+    @staticmethod
+    def _add(entry, start):
+        wall, cpu, blocks = PhaseProfiler._snapshot()
+        entry['calls'] = entry.get('calls', 0) + 1
+        entry['wall_seconds'] = entry.get('wall_seconds', 0.0) + wall - start[0]
+        entry['cpu_seconds'] = entry.get('cpu_seconds', 0.0) + cpu - start[1]
+        entry['allocated_blocks'] = entry.get('allocated_blocks', 0) + blocks - start[2]
+    
+    @contextmanager
+    def phase(self, name):
+        """Time a named phase; repeated phases accumulate."""
+        if not self.enabled:
+            yield
+            return
+        entry = self.phases.setdefault(name, {})  # registered on entry, so reports list phases in start order
+        start = self._snapshot()
+        try:
+            yield
+        finally:
+            self._add(entry, start)
+    
+    @contextmanager
+    def round(self, round_num):
+        """Time the work on one bracket round."""
+        if not self.enabled:
+            yield
+            return
+        entry = self.rounds.setdefault(int(round_num), {})
+        start = self._snapshot()
+        try:
+            yield
+        finally:
+            self._add(entry, start)
+    
+    def count(self, name, amount, round_num=None):
+        """Add to a counter (tournaments, series, games), overall and optionally per round."""
+        if not self.enabled:
+            return
+        self.counters[name] += int(amount)
+        if round_num is not None:
+            entry = self.rounds.setdefault(int(round_num), {})
+            entry[name] = entry.get(name, 0) + int(amount)
+    
+    def report(self):
+        """Plain-dict (JSON-ready) copy of everything recorded."""
+        return {
+            'phases': {name: dict(entry) for name, entry in self.phases.items()},
+            'rounds': {round_num: dict(entry) for round_num, entry in sorted(self.rounds.items())},
+            'counters': dict(self.counters),
+        }
+    
+    def merge(self, report):
+        """Add a report (e.g. from a worker's block) into this profiler."""
+        if not report:
+            return
+        for target, entries in ((self.phases, report['phases']), (self.rounds, report['rounds'])):
+            for key, entry in entries.items():
+                total = target.setdefault(key, {})
+                for field, value in entry.items():
+                    total[field] = total.get(field, 0) + value
+        self.counters.update(report['counters'])
+    
+    def write_report(self, filename, **extra):
+        """Write the report as JSON, with any extra top-level fields."""
+        report = {'version': 1, **extra, **self.report()}
+        report['rounds'] = {str(round_num): entry for round_num, entry in report['rounds'].items()}
+        Path(filename).write_text(json.dumps(report, indent=2, default=str))
+
+
+class ImportanceTilt:
+    """
+    Importance-sampling proposal aimed at one team: the engines let it win each
+    of its matchups (cold) or games (hot) with probability at least prob, and
+    log_weights[:, r] collects the log likelihood ratio (true over tilted
+    probability of what happened) of its results in the r-th round. Only the
+    team's own results are tilted, so a bracket's likelihood ratio up to a round
+    is the product of those entries; prob=1 (cold only) forces the team through.
+    """
+    
+    def __init__(self, team, prob, num_tournaments, num_rounds):
+        self.team = team
+        self.prob = prob
+        self.log_weights = np.zeros((num_tournaments, num_rounds))
+    
+    def begin(self, round_pos, rows, team1, team2):
+        """Aim at a set of matchups of one round; rows are their tournament indices."""
+        self.round_pos = round_pos
+        self.rows = rows
+        self.is_team1 = team1 == self.team
+        self.is_team2 = team2 == self.team
+    
+    def adjust(self, prob_team1):
+        """Tilted probabilities that team1 wins the current matchups (or games)."""
+        prob_team = np.maximum(np.where(self.is_team1, prob_team1, 1.0 - prob_team1), self.prob)
+        return np.where(self.is_team1, prob_team, np.where(self.is_team2, 1.0 - prob_team, prob_team1))
+    
+    def record(self, prob_team1, tilted_team1, team1_wins, played):
+        """Add the log likelihood ratios of the team's results among the played matchups (or games)."""
+        mask = (self.is_team1 | self.is_team2) & played
+        if not mask.any():
+            return
+        # A forced result never takes the branch that would divide by zero
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(team1_wins, prob_team1 / tilted_team1, (1.0 - prob_team1) / (1.0 - tilted_team1))
+        # The team plays at most one matchup per tournament and round, so rows are unique
+        self.log_weights[self.rows[mask], self.round_pos] += np.log(ratio[mask])
+
+
+# spawn_key prefix of the importance-sampling seed streams (plain run blocks use (i,))
+IMPORTANCE_SPAWN_KEY = 0x15
+
+# Result file extensions written with pyarrow (anything else is exported as CSV)
+COLUMNAR_SUFFIXES = ('.parquet', '.arrow', '.feather')
+
+# Statistics that add up across independent runs (blocks, workers, shards)
+STATS_STATE_KEYS = (
+    'simulations_run', 'championship_wins', 'round_reaches', 'teams_alive', 'user_round_reaches', 'meetings',
+    'upset_summary', 'series_summary', 'upset_tracker', 'series_stats'
+)
+
+
+def empty_stats_state():
+    """Fresh statistics for a simulator or a merge accumulator."""
+    return {
+        'simulations_run': 0,
+        'championship_wins': Counter(),
+        'round_reaches': defaultdict(Counter),
+        'teams_alive': defaultdict(Counter),
+        # round_num -> {username: simulations where any of the user's teams won a matchup of that round}
+        'user_round_reaches': defaultdict(Counter),
+        # (round_num, team_id) -> {opponent_id: times met}, stored both ways round (track_meetings)
+        'meetings': defaultdict(Counter),
+        # Streaming upset/series accumulators: memory stays constant in the number of simulations
+        'upset_summary': {'total': 0, 'by_round': Counter(), 'elo_diff_sum': 0.0, 'max_elo_diff': 0.0},
+        'series_summary': {'total': 0, 'length_counts': Counter(), 'elo_swing_sum': 0.0, 'max_elo_swing': 0.0},
+        # Raw upset/series dicts, only for sampled tournaments (capture_every)
+        'upset_tracker': [],
+        'series_stats': []
+    }
+
+
+def merge_stats_states(total, state):
+    """Add one stats state into another in place."""
+    total['simulations_run'] += state['simulations_run']
+    total['championship_wins'].update(state['championship_wins'])
+    for key in ('round_reaches', 'teams_alive', 'user_round_reaches', 'meetings'):
+        for group, counts in state[key].items():
+            total[key][group].update(counts)
+    
+    upsets, other = total['upset_summary'], state['upset_summary']
+    upsets['total'] += other['total']
+    upsets['by_round'].update(other['by_round'])
+    upsets['elo_diff_sum'] += other['elo_diff_sum']
+    upsets['max_elo_diff'] = max(upsets['max_elo_diff'], other['max_elo_diff'])
+    
+    series, other = total['series_summary'], state['series_summary']
+    series['total'] += other['total']
+    series['length_counts'].update(other['length_counts'])
+    series['elo_swing_sum'] += other['elo_swing_sum']
+    series['max_elo_swing'] = max(series['max_elo_swing'], other['max_elo_swing'])
+    
+    total['upset_tracker'].extend(state['upset_tracker'])
+    total['series_stats'].extend(state['series_stats'])
+    return total
+
+
+# On-disk shards: a stats state plus the run metadata needed to resume or merge it
+SHARD_VERSION = 1
+
+
+def stats_state_to_json(state):
+    """Convert a stats state to plain JSON types (round and game-count keys become strings)."""
+    def counts(counter):
+        return {str(key): value for key, value in counter.items()}
+    
+    return {
+        'simulations_run': state['simulations_run'],
+        'championship_wins': dict(state['championship_wins']),
+        'round_reaches': {str(r): dict(c) for r, c in state['round_reaches'].items()},
+        'teams_alive': {str(r): dict(c) for r, c in state['teams_alive'].items()},
+        'user_round_reaches': {str(r): dict(c) for r, c in state['user_round_reaches'].items()},
+        'meetings': [[r, team_id, dict(c)] for (r, team_id), c in state['meetings'].items()],
+        'upset_summary': {**state['upset_summary'], 'by_round': counts(state['upset_summary']['by_round'])},
+        'series_summary': {**state['series_summary'], 'length_counts': counts(state['series_summary']['length_counts'])},
+        'upset_tracker': state['upset_tracker'],
+        'series_stats': state['series_stats'],
+    }
+
+
+def stats_state_from_json(data):
+    """Inverse of stats_state_to_json."""
+    state = empty_stats_state()
+    state['simulations_run'] = data['simulations_run']
+    state['championship_wins'].update(data['championship_wins'])
+    for key in ('round_reaches', 'teams_alive', 'user_round_reaches'):
+        for round_num, counts in data.get(key, {}).items():
+            state[key][int(round_num)].update(counts)
+    for round_num, team_id, counts in data.get('meetings', []):
+        state['meetings'][(round_num, team_id)].update(counts)
+    for key, counts_key in (('upset_summary', 'by_round'), ('series_summary', 'length_counts')):
+        summary = dict(data[key])
+        summary[counts_key] = Counter({int(k): v for k, v in data[key][counts_key].items()})
+        state[key] = summary
+    state['upset_tracker'] = list(data['upset_tracker'])
+    state['series_stats'] = list(data['series_stats'])
+    return state
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def write_shard(filename, shard):
+    """Write a shard atomically (a crash mid-write leaves the previous checkpoint intact)."""
+    path = Path(filename)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(json.dumps(shard, default=_json_default))
+    os.replace(tmp_path, path)
+
+
+def load_shard(filename):
+    """Read a shard written by write_shard, with its stats state rebuilt."""
+    shard = json.loads(Path(filename).read_text())
+    if shard.get('version') != SHARD_VERSION:
+        raise ValueError(f"Unsupported shard version {shard.get('version')} in {filename} (expected {SHARD_VERSION})")
+    shard['state'] = stats_state_from_json(shard['state'])
+    return shard
+
+
+class BracketStore:
+    """
+    Memory-mapped file of sampled brackets, one bit per matchup (set when the
+    team in slot 2 won), so a run can be stored once and queried many times.
+    
+    Layout: MAGIC, uint64 bracket count, uint32 header length, a JSON header
+    with the bracket topology and run settings, zero padding so rows start on
+    a 64-byte boundary, then one row of ceil(matchups / 8) bytes per bracket.
+    Open with BracketStore(filename); write with BracketStore.create.
+    """
+    MAGIC = b'TSBRKT\x00\x01'
+    PREFIX = struct.Struct('<8sQI')
+    ALIGN = 64
+    
+    def __init__(self, filename):
+        with open(filename, 'rb') as f:
+            magic, count, header_length = self.PREFIX.unpack(f.read(self.PREFIX.size))
+            if magic != self.MAGIC:
+                raise ValueError(f"{filename} is not a bracket store")
+            self.header = json.loads(f.read(header_length))
+        self.filename = filename
+        self.count = count
+        self.team_ids = self.header['team_ids']
+        self.matchup_ids = self.header['matchup_ids']
+        self.round_ranges = [tuple(r) for r in self.header['round_ranges']]
+        self.feeders = np.array(self.header['feeders'], dtype=np.int32).reshape(-1, 2)
+        self.first_round_teams = np.array(self.header['first_round_teams'], dtype=np.int32).reshape(-1, 2)
+        self.row_bytes = (len(self.matchup_ids) + 7) // 8
+        offset = self.data_offset(header_length)
+        self.rows = (np.memmap(filename, dtype=np.uint8, mode='r', offset=offset, shape=(count, self.row_bytes))
+                     if count else np.empty((0, self.row_bytes), dtype=np.uint8))
+    
+    def __len__(self):
+        return self.count
+    
+    @classmethod
+    def data_offset(cls, header_length):
+        return -(-(cls.PREFIX.size + header_length) // cls.ALIGN) * cls.ALIGN
+    
+    @classmethod
+    def create(cls, filename, header):
+        """Start a new store with the given JSON header; returns a BracketStoreWriter."""
+        return BracketStoreWriter(filename, header)
+    
+    def winners(self, start=0, stop=None):
+        """Decode brackets [start, stop) into an (n x matchups) array of winner team indices (-1 = none)."""
+        bits = np.unpackbits(self.rows[start:stop], axis=1, count=len(self.matchup_ids)).astype(bool)
+        winners = np.full(bits.shape, -1, dtype=np.int32)
+        for round_num, lo, hi in self.round_ranges:
+            if round_num == 1:
+                team1, team2 = self.first_round_teams[lo:hi, 0], self.first_round_teams[lo:hi, 1]
+            else:
+                feeder1, feeder2 = self.feeders[lo:hi, 0], self.feeders[lo:hi, 1]
+                team1 = np.where(feeder1 >= 0, winners[:, np.maximum(feeder1, 0)], -1)
+                team2 = np.where(feeder2 >= 0, winners[:, np.maximum(feeder2, 0)], -1)
+            winners[:, lo:hi] = np.where(bits[:, lo:hi], team2, team1)
+        return winners
+    
+    def iter_winners(self, chunk_size=100000):
+        """Yield decoded winner arrays for consecutive chunks of the store."""
+        for start in range(0, self.count, chunk_size):
+            yield self.winners(start, min(start + chunk_size, self.count))
+
+
+class BracketStoreWriter:
+    """Appends packed rows to a new BracketStore file, keeping the bracket count in the prefix current."""
+    
+    def __init__(self, filename, header):
+        header = json.dumps(header, default=_json_default).encode()
+        self.file = open(filename, 'wb')
+        self.count = 0
+        self.file.write(BracketStore.PREFIX.pack(BracketStore.MAGIC, 0, len(header)))
+        self.file.write(header)
+        self.file.write(b'\0' * (BracketStore.data_offset(len(header)) - BracketStore.PREFIX.size - len(header)))
+    
+    def append(self, rows):
+        self.file.write(np.ascontiguousarray(rows, dtype=np.uint8).tobytes())
+        self.count += len(rows)
+        end = self.file.tell()
+        self.file.seek(len(BracketStore.MAGIC))
+        self.file.write(struct.pack('<Q', self.count))
+        self.file.seek(end)
+    
+    def close(self):
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PickemScorer:
+    """
+    Scores bracket-pool (pick'em) entries against sampled brackets.
+    
+    picks is an (entries x matchups) array of picked team indices (-1 = no
+    pick) and points the (matchups,) points a correct pick is worth. Each
+    chunk of sampled brackets passed to add() is scored for every entry at
+    once: picks and outcomes become one-hot (matchup, team) matrices, so the
+    score table is one matrix product, and ranks come from a per-bracket
+    histogram of the integer scores. Memory is bounded by the chunk size,
+    never by the number of sampled brackets.
+    
+    Accumulates expected score, the probability of finishing first (ties
+    share the win), the distribution of finishing places 1..places (worse
+    places pooled) and the mean finishing place.
+    """
+    
+    def __init__(self, entry_ids, picks, points, places=10, chunk_cells=2**23):
+        self.entry_ids = list(entry_ids)
+        self.places = places
+        num_entries, num_matchups = picks.shape
+        points = np.asarray(points, dtype=np.float64)
+        fractional = points != np.round(points)
+        if fractional.any():
+            raise ValueError(f"Pick'em points must be whole numbers, got {sorted(set(points[fractional].tolist()))}")
+        points = points.astype(np.int64)
+        self.max_score = int(points.sum())
+        
+        # One column per (matchup, team) pair somebody picked
+        matchup_cols, team_cols = [], []
+        for m in range(num_matchups):
+            teams = np.unique(picks[:, m])
+            teams = teams[teams >= 0]
+            matchup_cols.extend([m] * len(teams))
+            team_cols.extend(teams.tolist())
+        self.matchup_cols = np.array(matchup_cols, dtype=np.int64)
+        self.team_cols = np.array(team_cols, dtype=np.int32)
+        column_of = {(m, t): k for k, (m, t) in enumerate(zip(matchup_cols, team_cols))}
+        
+        # (columns x entries) points for a correct pick; float32 holds integer scores exactly up to 2**24
+        self.pick_matrix = np.zeros((len(matchup_cols), num_entries), dtype=np.float32)
+        entries, matchups = np.nonzero(picks >= 0)
+        columns = [column_of[(m, t)] for m, t in zip(matchups.tolist(), picks[entries, matchups].tolist())]
+        self.pick_matrix[columns, entries] = points[matchups]
+        
+        # Brackets scored per matrix product, sized so the score table stays around chunk_cells
+        self.chunk_size = max(1, chunk_cells // max(num_entries, 1))
+        self.brackets_scored = 0
+        self.score_sum = np.zeros(num_entries)
+        self.score_sq_sum = np.zeros(num_entries)
+        self.wins = np.zeros(num_entries)
+        self.rank_sum = np.zeros(num_entries)
+        self.place_counts = np.zeros((num_entries, places + 1), dtype=np.int64)
+    
+    def add(self, winners):
+        """Score every entry against an (n x matchups) array of winner team indices."""
+        for start in range(0, len(winners), self.chunk_size):
+            self.add_chunk(winners[start:start + self.chunk_size])
+    
+    def add_chunk(self, winners):
+        n = len(winners)
+        num_entries = len(self.entry_ids)
+        outcomes = (winners[:, self.matchup_cols] == self.team_cols).astype(np.float32)
+        scores = np.rint(outcomes @ self.pick_matrix).astype(np.int32)  # brackets x entries
+        
+        # Per bracket: how many entries scored each value, and how many scored strictly more
+        width = self.max_score + 1
+        flat = scores + (np.arange(n, dtype=np.int32) * width)[:, None]
+        hist = np.bincount(flat.ravel(), minlength=n * width).reshape(n, width)
+        above = (np.cumsum(hist[:, ::-1], axis=1)[:, ::-1] - hist).astype(np.int32)
+        ranks = above.ravel().take(flat)
+        ranks += 1
+        
+        # Entries tied for the top score share the win
+        top = scores.max(axis=1)
+        rows, cols = np.nonzero(scores == top[:, None])
+        np.add.at(self.wins, cols, 1.0 / hist[rows, top[rows]])
+        
+        self.score_sum += scores.sum(axis=0, dtype=np.int64)
+        squares = scores.astype(np.float64)
+        self.score_sq_sum += np.einsum('ij,ij->j', squares, squares)
+        self.rank_sum += ranks.sum(axis=0, dtype=np.int64)
+        
+        # Places beyond self.places share the last bucket
+        np.minimum(ranks, self.places + 1, out=ranks)
+        ranks += np.arange(num_entries, dtype=np.int32) * (self.places + 1) - 1
+        self.place_counts += np.bincount(ranks.ravel(), minlength=num_entries * (self.places + 1)).reshape(num_entries, -1)
+        self.brackets_scored += n
+    
+    def results(self, confidence_z=1.96):
+        """Per-entry results, most likely winner first (ties broken by expected score)."""
+        n = self.brackets_scored
+        if n == 0:
+            return pd.DataFrame()
+        expected = self.score_sum / n
+        win_probability = self.wins / n
+        columns = {
+            'entry_id': self.entry_ids,
+            'expected_score': expected,
+            'score_std': np.sqrt(np.maximum(self.score_sq_sum / n - expected ** 2, 0.0)),
+            'win_probability': win_probability,
+            'win_ci': confidence_z * np.sqrt(win_probability * (1.0 - win_probability) / n),
+            'mean_place': self.rank_sum / n,
+        }
+        for place in range(1, self.places + 1):
+            columns[f'place_{place}_prob'] = self.place_counts[:, place - 1] / n
+        columns[f'place_{self.places + 1}_or_worse_prob'] = self.place_counts[:, self.places] / n
+        df = pd.DataFrame(columns)
+        order = np.lexsort((-df['expected_score'].to_numpy(), -df['win_probability'].to_numpy()))
+        return df.take(order).reset_index(drop=True)
+
+
+# Worker-process side of run_simulation(workers=N) and run_tournament_batch(workers=N)
+_worker_simulator = None
+_worker_simulators = None
+
+
+class BracketMatchup:
+    """One bracket row, kept as a compact record instead of a pandas Series."""
+    __slots__ = ('id', 'round_number', 'bracket_position', 'team1_id', 'team2_id',
+                 'winner_id', 'status', 'parent_matchup_id', 'parent_position')
+    
+    def __init__(self, id, round_number, bracket_position, team1_id, team2_id,
+                 winner_id, status, parent_matchup_id, parent_position):
+        self.id = id
+        self.round_number = round_number
+        self.bracket_position = bracket_position
+        self.team1_id = team1_id
+        self.team2_id = team2_id
+        self.winner_id = winner_id
+        self.status = status
+        self.parent_matchup_id = parent_matchup_id
+        self.parent_position = parent_position
+
+
+def team_matches_played(teams_df):
+    """
+    Matches behind each team's rating: the matches_played column, else
+    wins + losses, else NaN (treated as no recorded matches).
+    """
+    if 'matches_played' in teams_df.columns:
+        return pd.to_numeric(teams_df['matches_played'], errors='coerce')
+    if 'wins' in teams_df.columns and 'losses' in teams_df.columns:
+        return pd.to_numeric(teams_df['wins'], errors='coerce') + pd.to_numeric(teams_df['losses'], errors='coerce')
+    return pd.Series(np.nan, index=teams_df.index)
+
+
+def load_tournament_tables(db_path, tournament_id):
+    """
+    Read a tournament straight from the app database. Returns (teams_df,
+    matchups_df) in the same shape as the playoff_teams/playoff_matchups CSV
+    exports. Each team's ELO is its latest elo_ratings row (NaN if it has none);
+    matches_played is that row's wins + losses, as the app reports it, falling
+    back to wins + losses of its latest ratings_history snapshot.
+    """
+    if not Path(db_path).exists():
+        raise FileNotFoundError(f"Database file '{db_path}' not found")
+    
+    con = sqlite3.connect(db_path)
+    try:
+        tournament = con.execute("SELECT name FROM tournaments WHERE id = ?", (tournament_id,)).fetchone()
+        if tournament is None:
+            raise ValueError(f"Tournament '{tournament_id}' not found in {db_path}")
+        
+        matchups_df = pd.read_sql("""
+            SELECT id, tournament_id, round_number, bracket_position, team1_id, team2_id,
+                   winner_id, status, votes_needed, created_at, completed_at,
+                   parent_matchup_id, parent_position
+            FROM tournament_matchups
+            WHERE tournament_id = ?
+            ORDER BY round_number, bracket_position
+        """, con, params=(tournament_id,))
+        
+        teams_df = pd.read_sql("""
+            SELECT t.id AS team_id, t.username,
+                   (SELECT er.elo FROM elo_ratings er
+                    WHERE er.team_id = t.id
+                    ORDER BY er.created_at DESC, er.id DESC LIMIT 1) AS elo,
+                   COALESCE(NULLIF((SELECT er.wins + er.losses FROM elo_ratings er
+                                    WHERE er.team_id = t.id
+                                    ORDER BY er.created_at DESC, er.id DESC LIMIT 1), 0),
+                            (SELECT rh.wins + rh.losses FROM ratings_history rh
+                             WHERE rh.team_id = t.id
+                             ORDER BY rh.computed_at DESC, rh.id DESC LIMIT 1)) AS matches_played
+            FROM teams t
+            WHERE t.id IN (SELECT team1_id FROM tournament_matchups WHERE tournament_id = ?
+                           UNION
+                           SELECT team2_id FROM tournament_matchups WHERE tournament_id = ?)
+        """, con, params=(tournament_id, tournament_id))
+    finally:
+        con.close()
+    
+    return teams_df, matchups_df
+
+
+def load_active_tournaments(db_path, statuses=('active',)):
+    """Return the tournaments (id, name, status) whose status is one of statuses, oldest first."""
+    if not Path(db_path).exists():
+        raise FileNotFoundError(f"Database file '{db_path}' not found")
+    
+    con = sqlite3.connect(db_path)
+    try:
+        placeholders = ', '.join('?' * len(statuses))
+        return pd.read_sql(f"""
+            SELECT id, name, status
+            FROM tournaments
+            WHERE status IN ({placeholders})
+            ORDER BY created_at, id
+        """, con, params=tuple(statuses))
+    finally:
+        con.close()
+
+
+def _init_worker(simulator):
+    global _worker_simulator
+    _worker_simulator = simulator
+
+
+def _run_worker_block(task):
+    method, block = task
+    return getattr(_worker_simulator, method)(*block)
+
+
+def _init_batch_worker(simulators):
+    global _worker_simulators
+    _worker_simulators = simulators
+
+
+def _run_batch_worker_block(task):
+    key, method, block = task
+    return getattr(_worker_simulators[key], method)(*block)
+
 
 class TournamentSimulator:
-    def __init__(self, teams_file='playoff_teams.csv', matchups_file='playoff_matchups.csv'):
-        """Initialize the tournament simulator with team and matchup data."""
-        self.teams_df = pd.read_csv(teams_file)
-        self.matchups_df = pd.read_csv(matchups_file)
+    def __init__(self, teams_file='playoff_teams.csv', matchups_file='playoff_matchups.csv', profiler=None):
+        """
+        Initialize the tournament simulator with team and matchup data.
+        Either argument may be a CSV path or an already-loaded DataFrame.
+        profiler, if given, is a PhaseProfiler that records where the time goes.
+        """
+        self.profiler = profiler or PhaseProfiler(enabled=False)
+        with self.profiler.phase('load_inputs'):
+            self.teams_df = teams_file if isinstance(teams_file, pd.DataFrame) else pd.read_csv(teams_file)
+            self.matchups_df = matchups_file if isinstance(matchups_file, pd.DataFrame) else pd.read_csv(matchups_file)
         
         # Default K-factor for ELO updates (matches your BASE_K_FACTOR)
         self.k_factor = 128
         
+        # Random source for the python engine (reseeded per block by run_block)
+        self.game_rng = random.Random()
+        
+        # Confidence level for the intervals reported next to sampled probabilities
+        self.confidence = 0.95
+        
+        # Keep raw upset/series dicts for every Nth tournament of a block (python engine, 0 = off);
+        # everything else is aggregated in constant memory
+        self.capture_every = 0
+        
+        # Count how often each pair of teams meets in each round (sampled runs; exact
+        # runs derive meeting odds from the bracket DP on demand)
+        self.track_meetings = False
+        
+        # Return every sampled bracket from run_block, bit-packed (see BracketStore)
+        # or as the raw winner array (for run_simulation's on_winners)
+        self.store_brackets = False
+        self.return_winners = False
+        
+        # Hot series can be sampled in one draw from memoized exact outcome tables
+        self.use_series_cache = False
+        self.series_cache = SeriesOutcomeCache(self.series_outcome_distribution)
+        
+        # Draw each team's starting ELO per simulation around its rating (see sample_team_elos):
+        # the SD of a rating backed by one match, shrinking with sqrt(matches played); None = exact ratings
+        self.rating_uncertainty = None
+        
         # Create team lookup for quick access
         self.teams = {}
-        for _, team in self.teams_df.iterrows():
-            self.teams[team['team_id']] = {
-                'id': team['team_id'],
-                'username': team['username'],
-                'elo': float(team['elo']) if pd.notna(team['elo']) else 1500.0
+        matches_played = team_matches_played(self.teams_df)
+        for team_id, username, elo, matches in zip(self.teams_df['team_id'], self.teams_df['username'],
+                                                   self.teams_df['elo'], matches_played):
+            self.teams[team_id] = {
+                'id': team_id,
+                'username': username,
+                'elo': float(elo) if pd.notna(elo) else 1500.0,
+                'matches_played': float(matches) if pd.notna(matches) else 0.0
             }
         
         print(f"Loaded {len(self.teams)} teams and {len(self.matchups_df)} matchups")
         
+        # Store original ELO ratings to reset between simulations (hot runs mutate self.teams)
+        self.original_elos = {team_id: team_data['elo'] for team_id, team_data in self.teams.items()}
+        
         # Build bracket structure
-        self.build_bracket_structure()
+        with self.profiler.phase('build_team_index'):
+            self.build_team_index()
+        with self.profiler.phase('build_bracket_structure'):
+            self.build_bracket_structure()
         
         # Initialize statistics tracking
         self.reset_stats()
+        
+        # Completed matchups are locked in; only the undecided part of the bracket is simulated
+        self.locked_winners = np.full(len(self.matchup_ids), -1, dtype=np.int32)
+        locked = self.update_results(self.matchups_df)
+        if len(locked):
+            print(f"Locked in {len(locked)} completed matchups")
     
     def build_bracket_structure(self):
-        """Build the tournament bracket structure from matchup data."""
+        """
+        Build the tournament bracket structure from matchup data and compile it
+        into integer arrays so every simulation path walks the bracket in O(matchups).
+        
+        Matchups are numbered 0..M-1 in (round, bracket_position) order:
+        - round_ranges: [(round_num, lo, hi)], the index range of each round
+        - first_round_teams: (matchups in round 1, 2) team indices, -1 for a bye
+        - parent_index / parent_slot: the matchup each one feeds and the slot (0/1) it fills
+        - feeders: (M, 2) inverse of the above, -1 where no matchup feeds the slot
+        
+        Completed results are compiled separately by update_results.
+        """
         # Group matchups by round
         self.rounds = {}
-        for _, matchup in self.matchups_df.iterrows():
-            round_num = matchup['round_number']
-            if round_num not in self.rounds:
-                self.rounds[round_num] = []
-            self.rounds[round_num].append(matchup)
+        columns = self.matchups_df[list(BracketMatchup.__slots__)]
+        for row in columns.itertuples(index=False, name=None):
+            matchup = BracketMatchup(*row)
+            if matchup.round_number not in self.rounds:
+                self.rounds[matchup.round_number] = []
+            self.rounds[matchup.round_number].append(matchup)
         
         # Sort each round by bracket position
         for round_num in self.rounds:
             self.rounds[round_num] = sorted(self.rounds[round_num], 
-                                          key=lambda x: x['bracket_position'])
+                                          key=lambda x: x.bracket_position)
         
         self.max_round = max(self.rounds.keys())
         print(f"Tournament has {self.max_round} rounds")
@@ -78,29 +903,147 @@ class TournamentSimulator:
         for round_num in sorted(self.rounds.keys()):
             round_matchups = len(self.rounds[round_num])
             print(f"  Round {round_num}: {round_matchups} matchups")
+        
+        # Number the matchups and record each round's index range
+        self.matchup_ids = []
+        self.round_ranges = []
+        for round_num in sorted(self.rounds.keys()):
+            lo = len(self.matchup_ids)
+            self.matchup_ids.extend(m.id for m in self.rounds[round_num])
+            self.round_ranges.append((round_num, lo, len(self.matchup_ids)))
+        self.matchup_index = {matchup_id: i for i, matchup_id in enumerate(self.matchup_ids)}
+        num_matchups = len(self.matchup_ids)
+        
+        # A matchup's feeders are the earlier-round matchups pointing at it,
+        # ordered by parent_position; the first two fill slots 0 and 1
+        candidates = defaultdict(list)
+        for round_num, lo, hi in self.round_ranges:
+            for i, matchup in enumerate(self.rounds[round_num], start=lo):
+                target = self.matchup_index.get(matchup.parent_matchup_id)
+                if target is not None:
+                    candidates[target].append((matchup.parent_position, i))
+        
+        self.feeders = np.full((num_matchups, 2), -1, dtype=np.int32)
+        self.parent_index = np.full(num_matchups, -1, dtype=np.int32)
+        self.parent_slot = np.full(num_matchups, -1, dtype=np.int8)
+        round_of = np.zeros(num_matchups, dtype=np.int64)
+        for round_num, lo, hi in self.round_ranges:
+            round_of[lo:hi] = round_num
+        self.matchup_rounds = round_of
+        for target, feeders in candidates.items():
+            if round_of[target] == 1:
+                continue  # round 1 takes its teams from the CSV
+            feeders = [f for f in feeders if round_of[f[1]] < round_of[target]]
+            feeders.sort(key=lambda f: f[0])
+            for slot, (_, i) in enumerate(feeders[:2]):
+                self.feeders[target, slot] = i
+                self.parent_index[i] = target
+                self.parent_slot[i] = slot
+        
+        first_round = [m for m in self.rounds.get(1, [])]
+        self.first_round_teams = np.array(
+            [[self.team_index.get(m.team1_id, -1), self.team_index.get(m.team2_id, -1)] for m in first_round],
+            dtype=np.int32
+        ).reshape(-1, 2)
+        self.final_matchup = next(lo for round_num, lo, hi in self.round_ranges if round_num == self.max_round)
+    
+    def update_results(self, matchups_df):
+        """
+        Lock in the winners of completed matchups from a fresh read of the
+        tournament_matchups rows (same bracket, newer winner_id/status values).
+        Returns the indices of matchups whose locked result changed. When exact
+        odds are loaded they are refreshed incrementally: only the changed
+        matchups and the path above them are recomputed.
+        """
+        locked_winners = np.full(len(self.matchup_ids), -1, dtype=np.int32)
+        for matchup in matchups_df.itertuples(index=False):
+            i = self.matchup_index.get(matchup.id)
+            if i is not None and matchup.status == 'completed':
+                locked_winners[i] = self.team_index.get(matchup.winner_id, -1)
+        
+        changed = np.flatnonzero(locked_winners != self.locked_winners)
+        self.locked_winners = locked_winners
+        self.matchups_df = matchups_df
+        if self.exact and len(changed):
+            self.compute_exact_odds(changed)
+        return changed
+    
+    def clear_results(self):
+        """Forget completed results and simulate the whole bracket again."""
+        self.locked_winners[:] = -1
+        self.winner_distributions = []
+    
+    def update_ratings(self, elos):
+        """
+        Replace team ELO ratings (team_id -> elo; ids not in the bracket are
+        ignored) without rebuilding the bracket. Returns the ids of teams whose
+        rating changed. Exact odds, when loaded, are recomputed.
+        """
+        changed = []
+        for team_id, elo in elos.items():
+            if team_id not in self.teams:
+                continue
+            elo = float(elo) if pd.notna(elo) else 1500.0
+            if elo != self.original_elos[team_id]:
+                self.original_elos[team_id] = elo
+                changed.append(team_id)
+        
+        if changed:
+            self.reset_team_elos()
+            self.build_team_index()
+            if self.exact:
+                self.compute_exact_odds()
+        return changed
+    
+    def build_team_index(self):
+        """
+        Intern team ids to dense integer indices for the vectorized engines.
+        Index -1 is used throughout the engines for a missing team (bye).
+        """
+        self.team_ids = list(self.teams.keys())
+        self.team_index = {team_id: i for i, team_id in enumerate(self.team_ids)}
+        self.base_elos = np.array([self.original_elos[t] for t in self.team_ids], dtype=np.float64)
+        self.matches_played = np.array([self.teams[t]['matches_played'] for t in self.team_ids], dtype=np.float64)
+        
+        # Usernames interned the same way, for joint per-user tallies
+        self.usernames = list(dict.fromkeys(self.teams[t]['username'] for t in self.team_ids))
+        user_index = {username: i for i, username in enumerate(self.usernames)}
+        self.team_users = np.array([user_index[self.teams[t]['username']] for t in self.team_ids], dtype=np.int32)
+        
+        # P[i, j] = probability that team i beats team j (same formula as elo_win_probability)
+        self.win_prob_matrix = 1.0 / (1.0 + np.power(10.0, (self.base_elos[None, :] - self.base_elos[:, None]) / 400.0))
     
     def reset_stats(self):
         """Reset all statistics tracking."""
-        self.championship_wins = Counter()
-        self.round_reaches = defaultdict(Counter)  # round_num -> {username: count}
-        self.teams_alive = defaultdict(Counter)     # round_num -> {username: times_alive_at_start}
+        # championship_wins, round_reaches (round_num -> {team_id: count}),
+        # teams_alive (round_num -> {team_id: times_alive_at_start}), upsets and series
+        self.load_stats_state(empty_stats_state())
         self.regional_performance = defaultdict(Counter)
-        self.upset_tracker = []
-        self.series_stats = []  # Track detailed series information
         self.elo_changes = defaultdict(list)  # Track ELO changes throughout tournament
-        self.simulations_run = 0
+        # Exact mode stores probabilities in the counters over a single "simulation"
+        self.exact = False
+        self.winner_distributions = []
+        # Importance-sampled odds of chosen long shots (run_long_shot_odds)
+        self.long_shot_odds = {}
         
-        # Store original ELO ratings to reset between simulations
-        self.original_elos = {}
-        for team_id, team_data in self.teams.items():
-            self.original_elos[team_id] = team_data['elo']
+        # Undo ELO changes left over from a previous hot run
+        self.reset_team_elos()
+    
+    def get_stats_state(self):
+        """Return the mergeable statistics of this simulator (see merge_stats_states)."""
+        return {key: getattr(self, key) for key in STATS_STATE_KEYS}
+    
+    def load_stats_state(self, state):
+        """Replace the mergeable statistics with the given state."""
+        for key in STATS_STATE_KEYS:
+            setattr(self, key, state[key])
     
     def elo_win_probability(self, elo_a, elo_b):
         """
         Calculate the probability that team A beats team B based on ELO ratings.
         Uses the logistic function: P(A beats B) = 1 / (1 + 10^((elo_b - elo_a)/400))
         """
-        return 1.0 / (1.0 + math.pow(10, (elo_b - elo_a) / 400.0))
+        return win_probability(elo_a, elo_b)
     
     def simulate_game(self, team1_elo, team2_elo):
         """
@@ -108,14 +1051,14 @@ class TournamentSimulator:
         Returns True if team1 wins, False if team2 wins.
         """
         prob_team1_wins = self.elo_win_probability(team1_elo, team2_elo)
-        return random.random() < prob_team1_wins
+        return self.game_rng.random() < prob_team1_wins
     
     def calculate_expected_score(self, rating_a, rating_b):
         """
         Calculate expected score using the same logic as your index.js.
         This matches the calculateExpectedScore function.
         """
-        return 1.0 / (1.0 + math.pow(10, (rating_b - rating_a) / 400.0))
+        return win_probability(rating_a, rating_b)
     
     def calculate_adaptive_k_factor(self, base_k, vote_weight, matches_played):
         """
@@ -136,6 +1079,14 @@ class TournamentSimulator:
         This matches the calculateNewEloRatings function from index.js.
         Returns (new_winner_elo, new_loser_elo)
         """
+        winner_delta, loser_delta = self.elo_rating_deltas(winner_elo, loser_elo, vote_weight,
+                                                           winner_matches, loser_matches)
+        
+        # Round the final ELO values (same as your index.js)
+        return round(winner_elo + winner_delta), round(loser_elo + loser_delta)
+    
+    def elo_rating_deltas(self, winner_elo, loser_elo, vote_weight=1.0, winner_matches=0, loser_matches=0):
+        """Unrounded (winner, loser) rating changes of update_elo_ratings."""
         # Calculate expected scores (same as your index.js)
         winner_expected = self.calculate_expected_score(winner_elo, loser_elo)
         loser_expected = 1.0 - winner_expected
@@ -145,12 +1096,45 @@ class TournamentSimulator:
         loser_k = self.calculate_adaptive_k_factor(self.k_factor, vote_weight, loser_matches)
         
         # Update ELO ratings (winner gets 1, loser gets 0)
-        winner_new_elo = winner_elo + winner_k * (1.0 - winner_expected)
-        loser_new_elo = loser_elo + loser_k * (0.0 - loser_expected)
-        
-        # Round the final ELO values (same as your index.js)
-        return round(winner_new_elo), round(loser_new_elo)
+        return winner_k * (1.0 - winner_expected), loser_k * (0.0 - loser_expected)
 
+    def series_outcome_distribution(self, team1_elo, team2_elo):
+        """
+        Compute the exact outcome distribution of a best-of-7 series by walking
+        the Markov chain of (team1 wins, team2 wins, team1 ELO, team2 ELO) states.
+        Uses the same game probabilities and rating updates as simulate_matchup,
+        so the distribution matches replaying the series game by game. The table
+        is marked shift_exact unless some update is a float-rounding near-tie.
+        """
+        states = {(0, 0, team1_elo, team2_elo): 1.0}
+        finished = defaultdict(float)
+        shift_exact = True
+        
+        for game in range(7):
+            games_played = 10 + game  # same baseline experience as simulate_matchup
+            next_states = defaultdict(float)
+            for (wins1, wins2, elo1, elo2), prob in states.items():
+                prob_team1_wins = self.elo_win_probability(elo1, elo2)
+                
+                win1, loss2 = self.elo_rating_deltas(elo1, elo2, 1.0, games_played, games_played)
+                next_states[(wins1 + 1, wins2, round(elo1 + win1), round(elo2 + loss2))] += prob * prob_team1_wins
+                
+                win2, loss1 = self.elo_rating_deltas(elo2, elo1, 1.0, games_played, games_played)
+                next_states[(wins1, wins2 + 1, round(elo1 + loss1), round(elo2 + win2))] += prob * (1.0 - prob_team1_wins)
+                
+                if shift_exact:
+                    shift_exact = all(shift_exact_delta(delta) for delta in (win1, loss2, win2, loss1))
+            
+            states = {}
+            for state, prob in next_states.items():
+                wins1, wins2, elo1, elo2 = state
+                if wins1 == 4 or wins2 == 4:
+                    finished[(wins1 == 4, wins1 + wins2, elo1, elo2)] += prob
+                else:
+                    states[state] = prob
+        
+        return SeriesOutcomes([key + (prob,) for key, prob in finished.items()], shift_exact)
+    
     def simulate_matchup(self, team1_id, team2_id, hot_simulation=True):
         """
         Simulate a matchup between two teams.
@@ -174,7 +1158,7 @@ class TournamentSimulator:
         if not hot_simulation:
             # Original simulation logic
             prob_team1_wins = self.elo_win_probability(initial_team1_elo, initial_team2_elo)
-            team1_wins_series = random.random() < prob_team1_wins
+            team1_wins_series = self.game_rng.random() < prob_team1_wins
             
             if team1_wins_series:
                 winner_id = team1_id
@@ -185,6 +1169,34 @@ class TournamentSimulator:
             
             return winner_id, upset, None
         
+        if self.use_series_cache:
+            # Sample the whole series in one draw from its memoized outcome table
+            outcomes, shift = self.series_cache.lookup(initial_team1_elo, initial_team2_elo, self.k_factor)
+            team1_won, games_played, final_team1_elo, final_team2_elo = outcomes.sample(self.game_rng.random())
+            team1_wins = 4 if team1_won else games_played - 4
+            current_team1_elo = final_team1_elo + shift
+            current_team2_elo = final_team2_elo + shift
+            self.teams[team1_id]['elo'] = current_team1_elo
+            self.teams[team2_id]['elo'] = current_team2_elo
+            
+            if team1_wins == 4:
+                winner_id = team1_id
+                upset = initial_team1_elo < initial_team2_elo
+            else:
+                winner_id = team2_id
+                upset = initial_team2_elo < initial_team1_elo
+            
+            return winner_id, upset, {
+                'initial_team1_elo': initial_team1_elo,
+                'initial_team2_elo': initial_team2_elo,
+                'final_team1_elo': current_team1_elo,
+                'final_team2_elo': current_team2_elo,
+                'team1_wins': team1_wins,
+                'team2_wins': games_played - team1_wins,
+                'games_played': games_played,
+                'game_results': []  # individual games are not replayed
+            }
+        
         # Hot simulation: Best-of-7 series (first to 4 wins)
         team1_wins = 0
         team2_wins = 0
@@ -259,201 +1271,1192 @@ class TournamentSimulator:
         
         return winner_id, upset, series_details
     
-    def reset_team_elos(self):
-        """Reset all team ELO ratings to their original values."""
+    def reset_team_elos(self, starting_elos=None):
+        """
+        Reset all team ELO ratings to their original values, or to
+        starting_elos (an array by team index, see sample_team_elos).
+        """
+        if starting_elos is not None:
+            for team_id, elo in zip(self.team_ids, starting_elos):
+                self.teams[team_id]['elo'] = float(elo)
+            return
         for team_id in self.teams:
             self.teams[team_id]['elo'] = self.original_elos[team_id]
 
-    def simulate_tournament(self, hot_simulation=True):
+    def simulate_tournament(self, hot_simulation=True, starting_elos=None):
         """
         Simulate a complete tournament and return the champion.
+        starting_elos, if given, replaces the teams' ratings for this tournament
+        (an array by team index, see sample_team_elos).
         Returns (champion_id, detailed_results)
         """
         # Reset ELO ratings to original values for this simulation
-        self.reset_team_elos()
+        self.reset_team_elos(starting_elos)
         
         # Track results for this simulation - map matchup_id to winner_id
         matchup_winners = {}
+        winners_by_index = [None] * len(self.matchup_ids)
         upsets_this_sim = []
         series_details_this_sim = []
         
-        # Simulate each round in order
-        for round_num in sorted(self.rounds.keys()):
-            for matchup in self.rounds[round_num]:
-                matchup_id = matchup['id']
-                
-                if round_num == 1:
-                    # First round - use teams from CSV
-                    team1_id = matchup['team1_id']
-                    team2_id = matchup['team2_id']
-                else:
-                    # Later rounds - get winners from parent matchups
-                    # Find the two matchups that feed into this one
-                    parent_matchups = []
-                    for prev_round_num in range(1, round_num):
-                        for prev_matchup in self.rounds[prev_round_num]:
-                            if prev_matchup['parent_matchup_id'] == matchup_id:
-                                parent_matchups.append((prev_matchup['id'], prev_matchup['parent_position']))
-                    
-                    # Sort by parent position to get team1 and team2
-                    parent_matchups.sort(key=lambda x: x[1])
+        # Simulate each round in order, walking the compiled bracket
+        for round_num, lo, hi in self.round_ranges:
+            with self.profiler.round(round_num):
+                for i in range(lo, hi):
+                    matchup_id = self.matchup_ids[i]
                     
-                    if len(parent_matchups) >= 2:
-                        team1_id = matchup_winners.get(parent_matchups[0][0])
-                        team2_id = matchup_winners.get(parent_matchups[1][0])
-                    elif len(parent_matchups) == 1:
-                        # Only one parent (bye situation)
-                        team1_id = matchup_winners.get(parent_matchups[0][0])
-                        team2_id = None
+                    if round_num == 1:
+                        # First round - use teams from CSV
+                        team1_index, team2_index = self.first_round_teams[i]
+                        team1_id = self.team_ids[team1_index] if team1_index >= 0 else None
+                        team2_id = self.team_ids[team2_index] if team2_index >= 0 else None
                     else:
-                        # No parents found, skip this matchup
-                        continue
-                
-                # Simulate the matchup
-                winner_id, is_upset, series_details = self.simulate_matchup(
-                    team1_id, team2_id, hot_simulation=hot_simulation
-                )
-                
-                if winner_id:
-                    matchup_winners[matchup_id] = winner_id
+                        # Later rounds - get winners from the matchups feeding each slot
+                        feeder1, feeder2 = self.feeders[i]
+                        if feeder1 < 0 and feeder2 < 0:
+                            # No parents found, skip this matchup
+                            continue
+                        team1_id = winners_by_index[feeder1] if feeder1 >= 0 else None
+                        team2_id = winners_by_index[feeder2] if feeder2 >= 0 else None
                     
-                    # Track series details if available
-                    if series_details:
-                        series_details['round'] = round_num
-                        series_details['matchup_id'] = matchup_id
-                        series_details['team1_id'] = team1_id
-                        series_details['team2_id'] = team2_id
-                        series_details['team1_username'] = self.teams[team1_id]['username']
-                        series_details['team2_username'] = self.teams[team2_id]['username']
-                        series_details['winner_id'] = winner_id
-                        series_details_this_sim.append(series_details)
+                    if self.locked_winners[i] >= 0:
+                        # Already decided: take the recorded winner without playing it
+                        winner_id, is_upset, series_details = self.team_ids[self.locked_winners[i]], False, None
+                    else:
+                        # Simulate the matchup
+                        winner_id, is_upset, series_details = self.simulate_matchup(
+                            team1_id, team2_id, hot_simulation=hot_simulation
+                        )
+                        if team1_id in self.teams and team2_id in self.teams:
+                            self.profiler.count('series', 1, round_num)
+                            self.profiler.count('games', series_details['games_played'] if series_details else 1, round_num)
                     
-                    # Track upsets
-                    if is_upset and team1_id and team2_id:
-                        loser_id = team1_id if winner_id == team2_id else team2_id
-                        upset_info = {
-                            'round': round_num,
-                            'winner': self.teams[winner_id]['username'],
-                            'loser': self.teams[loser_id]['username']
-                        }
+                    if winner_id:
+                        matchup_winners[matchup_id] = winner_id
+                        winners_by_index[i] = winner_id
                         
+                        # Track series details if available
                         if series_details:
-                            # Use initial ELO ratings for upset determination
-                            upset_info['winner_initial_elo'] = series_details['initial_team1_elo'] if winner_id == team1_id else series_details['initial_team2_elo']
-                            upset_info['loser_initial_elo'] = series_details['initial_team2_elo'] if winner_id == team1_id else series_details['initial_team1_elo']
-                            upset_info['winner_final_elo'] = series_details['final_team1_elo'] if winner_id == team1_id else series_details['final_team2_elo']
-                            upset_info['loser_final_elo'] = series_details['final_team2_elo'] if winner_id == team1_id else series_details['final_team1_elo']
-                        else:
-                            # Fallback to current ELO ratings
-                            upset_info['winner_initial_elo'] = self.original_elos[winner_id]
-                            upset_info['loser_initial_elo'] = self.original_elos[loser_id]
-                            upset_info['winner_final_elo'] = self.teams[winner_id]['elo']
-                            upset_info['loser_final_elo'] = self.teams[loser_id]['elo']
+                            series_details['round'] = round_num
+                            series_details['matchup_id'] = matchup_id
+                            series_details['team1_id'] = team1_id
+                            series_details['team2_id'] = team2_id
+                            series_details['team1_username'] = self.teams[team1_id]['username']
+                            series_details['team2_username'] = self.teams[team2_id]['username']
+                            series_details['winner_id'] = winner_id
+                            series_details_this_sim.append(series_details)
                         
-                        upsets_this_sim.append(upset_info)
+                        # Track upsets
+                        if is_upset and team1_id and team2_id:
+                            loser_id = team1_id if winner_id == team2_id else team2_id
+                            upset_info = {
+                                'round': round_num,
+                                'winner': self.teams[winner_id]['username'],
+                                'loser': self.teams[loser_id]['username']
+                            }
+                            
+                            if series_details:
+                                # Use initial ELO ratings for upset determination
+                                upset_info['winner_initial_elo'] = series_details['initial_team1_elo'] if winner_id == team1_id else series_details['initial_team2_elo']
+                                upset_info['loser_initial_elo'] = series_details['initial_team2_elo'] if winner_id == team1_id else series_details['initial_team1_elo']
+                                upset_info['winner_final_elo'] = series_details['final_team1_elo'] if winner_id == team1_id else series_details['final_team2_elo']
+                                upset_info['loser_final_elo'] = series_details['final_team2_elo'] if winner_id == team1_id else series_details['final_team1_elo']
+                            else:
+                                # Fallback to current ELO ratings
+                                upset_info['winner_initial_elo'] = self.original_elos[winner_id]
+                                upset_info['loser_initial_elo'] = self.original_elos[loser_id]
+                                upset_info['winner_final_elo'] = self.teams[winner_id]['elo']
+                                upset_info['loser_final_elo'] = self.teams[loser_id]['elo']
+                            
+                            upsets_this_sim.append(upset_info)
         
         # Find the champion (winner of the final round)
-        final_round_matchups = [m for m in self.rounds[self.max_round]]
-        champion_id = None
-        if final_round_matchups:
-            final_matchup_id = final_round_matchups[0]['id']
-            champion_id = matchup_winners.get(final_matchup_id)
+        champion_id = winners_by_index[self.final_matchup]
         
         return champion_id, matchup_winners, upsets_this_sim, series_details_this_sim
     
-    def run_simulation(self, num_simulations=10000, verbose=False, hot_simulation=True):
+    def record_tournament_result(self, champion_id, matchup_winners, upsets, series_details, capture=False):
         """
-        Run multiple tournament simulations and collect statistics.
+        Fold one simulated tournament from simulate_tournament into the statistics.
+        Upsets and series go into the streaming summaries; the raw dicts are only
+        kept when capture is set (see capture_every).
         """
-        sim_type = "hot (game-by-game)" if hot_simulation else "cold (single matchup)"
-        print(f"Running {num_simulations:,} {sim_type} tournament simulations...")
+        if not champion_id:
+            return
         
-        self.reset_stats()
+        # Track championship by team_id instead of username
+        self.championship_wins[champion_id] += 1
+        
+        # Track which teams are "alive" at the start of each round
+        # and which teams advance to the next round
+        teams_alive_this_sim = set()
         
-        for sim in range(num_simulations):
-            if verbose and (sim + 1) % 1000 == 0:
-                print(f"  Completed {sim + 1:,} simulations...")
+        # All teams start alive in round 1
+        for team_index in self.first_round_teams.ravel():
+            if team_index >= 0:
+                team_id = self.team_ids[team_index]
+                self.teams_alive[1][team_id] += 1
+                teams_alive_this_sim.add(team_id)
+        
+        # Track advancement through subsequent rounds
+        for round_num, lo, hi in self.round_ranges:
+            teams_advancing = set()
             
-            champion_id, matchup_winners, upsets, series_details = self.simulate_tournament(
-                hot_simulation=hot_simulation
-            )
+            for matchup_id in self.matchup_ids[lo:hi]:
+                winner_id = matchup_winners.get(matchup_id)
+                if winner_id and winner_id in self.teams:
+                    self.round_reaches[round_num][winner_id] += 1
+                    teams_advancing.add(winner_id)
             
-            if champion_id:
-                # Track championship by team_id instead of username
-                self.championship_wins[champion_id] += 1
-                
-                # Track which teams are "alive" at the start of each round
-                # and which teams advance to the next round
-                teams_alive_this_sim = set()
-                
-                # All teams start alive in round 1
-                for matchup in self.rounds[1]:
-                    if matchup['team1_id'] in self.teams:
-                        self.teams_alive[1][matchup['team1_id']] += 1
-                        teams_alive_this_sim.add(matchup['team1_id'])
-                    if matchup['team2_id'] in self.teams:
-                        self.teams_alive[1][matchup['team2_id']] += 1
-                        teams_alive_this_sim.add(matchup['team2_id'])
-                
-                # Track advancement through subsequent rounds
-                for round_num in sorted(self.rounds.keys()):
-                    teams_advancing = set()
-                    
-                    for matchup in self.rounds[round_num]:
-                        winner_id = matchup_winners.get(matchup['id'])
-                        if winner_id and winner_id in self.teams:
-                            self.round_reaches[round_num][winner_id] += 1
-                            teams_advancing.add(winner_id)
-                    
-                    # Teams advancing become alive in the next round
-                    if round_num < self.max_round:
-                        for team_id in teams_advancing:
-                            if team_id in self.teams:
-                                self.teams_alive[round_num + 1][team_id] += 1
-                
-                # Track upsets and series details
-                self.upset_tracker.extend(upsets)
-                self.series_stats.extend(series_details)
+            for username in {self.teams[team_id]['username'] for team_id in teams_advancing}:
+                self.user_round_reaches[round_num][username] += 1
+            
+            # Teams advancing become alive in the next round
+            if round_num < self.max_round:
+                for team_id in teams_advancing:
+                    if team_id in self.teams:
+                        self.teams_alive[round_num + 1][team_id] += 1
         
-        self.simulations_run = num_simulations
-        print(f"Simulation complete!")
-    
-    def get_championship_odds(self, top_n=20):
-        """Get championship odds for all teams, sorted by probability."""
-        if self.simulations_run == 0:
-            return []
+        if self.track_meetings:
+            for round_num, lo, hi in self.round_ranges:
+                for i in range(lo, hi):
+                    if round_num == 1:
+                        team1, team2 = (self.team_ids[t] if t >= 0 else None for t in self.first_round_teams[i])
+                    else:
+                        team1, team2 = (matchup_winners.get(self.matchup_ids[f]) if f >= 0 else None for f in self.feeders[i])
+                    if team1 in self.teams and team2 in self.teams:
+                        self.meetings[(round_num, team1)][team2] += 1
+                        self.meetings[(round_num, team2)][team1] += 1
         
-        odds = []
-        for team_id, wins in self.championship_wins.items():
-            probability = wins / self.simulations_run
-            team_data = self.teams[team_id]
-            odds.append({
-                'team_id': team_id,
-                'username': team_data['username'],
-                'championships': wins,
-                'probability': probability,
-                'odds': f"1 in {int(1/probability):.0f}" if probability > 0 else "No wins"
-            })
+        # Track upsets and series details
+        upset_diffs_by_round = defaultdict(list)
+        for upset in upsets:
+            upset_diffs_by_round[upset['round']].append(upset['loser_initial_elo'] - upset['winner_initial_elo'])
+        for round_num, diffs in upset_diffs_by_round.items():
+            self.record_upsets(round_num, np.array(diffs, dtype=np.float64))
         
-        # Sort by probability (highest first)
-        odds.sort(key=lambda x: x['probability'], reverse=True)
+        if series_details:
+            columns = [[series[key] for series in series_details] for key in
+                       ('initial_team1_elo', 'initial_team2_elo', 'final_team1_elo', 'final_team2_elo')]
+            self.record_series(*(np.array(c, dtype=np.float64) for c in columns),
+                               np.array([series['games_played'] for series in series_details], dtype=np.int64))
         
-        return odds[:top_n] if top_n else odds
+        if capture:
+            self.upset_tracker.extend(upsets)
+            self.series_stats.extend(series_details)
     
-    def get_round_advancement_odds(self, round_num, top_n=20):
-        """Get odds for teams to reach a specific round."""
-        if self.simulations_run == 0 or round_num not in self.round_reaches:
-            return []
+    def plan_blocks(self, num_simulations, block_size, seed=None):
+        """
+        Split a run into fixed-size blocks, each with its own independent seed
+        stream. The layout depends only on num_simulations, block_size and seed
+        (an int or a SeedSequence), never on the number of workers, so a seeded
+        run is reproducible.
+        """
+        sizes = [min(block_size, num_simulations - start) for start in range(0, num_simulations, block_size)]
+        root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        return list(zip(sizes, root.spawn(len(sizes))))
+    
+    def run_block(self, num_simulations, seed_sequence, hot_simulation=True, engine='numpy'):
+        """
+        Run one block of simulations into fresh statistics and return them as a
+        mergeable stats state (see get_stats_state).
+        """
+        self.reset_stats()
         
-        odds = []
-        for team_id, reaches in self.round_reaches[round_num].items():
-            probability = reaches / self.simulations_run
-            team_data = self.teams[team_id]
-            odds.append({
-                'team_id': team_id,
-                'username': team_data['username'],
+        # Profile into a fresh profiler so the block's report can travel back from a worker
+        parent_profiler, self.profiler = self.profiler, PhaseProfiler(self.profiler.enabled)
+        try:
+            if engine == 'numpy':
+                rng = np.random.default_rng(seed_sequence)
+                simulate_batch = self.simulate_tournaments_hot if hot_simulation else self.simulate_tournaments_cold
+                with self.profiler.phase('simulate'):
+                    winners = simulate_batch(num_simulations, rng)
+                with self.profiler.phase('record'):
+                    self.record_batch_results(winners)
+            else:
+                self.game_rng = random.Random(int.from_bytes(seed_sequence.generate_state(4).tobytes(), 'little'))
+                starting_elos = self.sample_team_elos(num_simulations, np.random.default_rng(seed_sequence.spawn(1)[0]))
+                keep_winners = self.store_brackets or self.return_winners
+                winners = np.full((num_simulations, len(self.matchup_ids)), -1, dtype=np.int32) if keep_winners else None
+                for sim in range(num_simulations):
+                    capture = self.capture_every > 0 and sim % self.capture_every == 0
+                    with self.profiler.phase('simulate'):
+                        result = self.simulate_tournament(hot_simulation=hot_simulation,
+                                                          starting_elos=None if starting_elos is None else starting_elos[sim])
+                    with self.profiler.phase('record'):
+                        self.record_tournament_result(*result, capture=capture)
+                        if winners is not None:
+                            matchup_winners = result[1]
+                            winners[sim] = [self.team_index.get(matchup_winners.get(matchup_id), -1)
+                                            for matchup_id in self.matchup_ids]
+            if self.store_brackets:
+                with self.profiler.phase('pack_brackets'):
+                    brackets = self.pack_brackets(winners)
+            self.profiler.count('tournaments', num_simulations)
+        finally:
+            block_profiler, self.profiler = self.profiler, parent_profiler
+        
+        self.simulations_run = num_simulations
+        state = self.get_stats_state()
+        if block_profiler.enabled:
+            state['profile'] = block_profiler.report()
+        if self.store_brackets:
+            state['brackets'] = brackets
+        if self.return_winners:
+            state['winners'] = winners
+        return state
+    
+    def pack_brackets(self, winners):
+        """
+        Pack an (n x matchups) winner array into BracketStore rows: bit i is set
+        when matchup i was won by the team in slot 2 (a bye counts as slot 1
+        winning when slot 1 is filled).
+        """
+        bits = np.zeros(winners.shape, dtype=bool)
+        for round_num, lo, hi in self.round_ranges:
+            team1, team2 = self.gather_round_teams(winners, round_num, lo, hi)
+            bits[:, lo:hi] = (team2 >= 0) & (winners[:, lo:hi] == team2)
+        return np.packbits(bits, axis=1)
+    
+    def bracket_topology(self):
+        """The bracket as plain JSON types: enough to decode BracketStore rows without a simulator."""
+        return {
+            'team_ids': self.team_ids,
+            'usernames': [self.teams[team_id]['username'] for team_id in self.team_ids],
+            'elos': [self.original_elos[team_id] for team_id in self.team_ids],
+            'matchup_ids': self.matchup_ids,
+            'round_ranges': self.round_ranges,
+            'feeders': self.feeders.tolist(),
+            'first_round_teams': self.first_round_teams.tolist(),
+            'locked_winners': self.locked_winners.tolist(),
+        }
+    
+    def open_worker_pool(self, workers):
+        """Return a process pool for simulation blocks, or None to run in-process."""
+        if workers <= 1:
+            return None
+        print(f"Using {workers} worker processes")
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,))
+    
+    def execute_blocks(self, blocks, pool=None, method='run_block'):
+        """
+        Run blocks in-process or on the pool and yield their results in block order.
+        method names the simulator method each block's arguments are passed to.
+        """
+        if pool is not None:
+            results = pool.map(_run_worker_block, [(method, block) for block in blocks])
+        else:
+            results = (getattr(self, method)(*block) for block in blocks)
+        for result in results:
+            if isinstance(result, dict):
+                self.profiler.merge(result.pop('profile', None))
+            yield result
+    
+    def print_series_cache_stats(self):
+        cache = self.series_cache.stats()
+        print(f"Series cache: {cache['entries']:,} entries, {cache['hits']:,} hits, "
+              f"{cache['misses']:,} misses ({cache['hit_rate']:.1%} hit rate), {cache['evictions']:,} evictions")
+    
+    def bracket_fingerprint(self):
+        """
+        Hash of the teams, ratings (and their spreads, when sampled), bracket and
+        locked results; shards only merge within one.
+        """
+        digest = hashlib.sha256()
+        for team_id in self.team_ids:
+            digest.update(f"{team_id}:{self.original_elos[team_id]!r};".encode())
+        digest.update(repr([int(m) if isinstance(m, (int, np.integer)) else m for m in self.matchup_ids]).encode())
+        for array in (self.feeders, self.first_round_teams, self.locked_winners):
+            digest.update(np.ascontiguousarray(array, dtype=np.int64).tobytes())
+        if self.rating_uncertainty is not None:
+            digest.update(f"rating_uncertainty:{self.rating_uncertainty!r};".encode())
+            digest.update(self.matches_played.tobytes())
+        return digest.hexdigest()
+    
+    def shard_config(self, hot_simulation, engine):
+        """Settings that must agree between shards for their counts to be added."""
+        return {
+            'mode': 'hot' if hot_simulation else 'cold',
+            'k_factor': self.k_factor if hot_simulation else None,
+            'engine': engine,
+            'fingerprint': self.bracket_fingerprint(),
+        }
+    
+    def run_simulation(self, num_simulations=10000, verbose=False, hot_simulation=True,
+                       engine='numpy', batch_size=None, workers=1, seed=None,
+                       checkpoint=None, checkpoint_every=10, bracket_store=None, on_winners=None):
+        """
+        Run multiple tournament simulations and collect statistics.
+        engine='numpy' uses the batched vectorized engines; engine='python' runs
+        one tournament at a time. Simulations are split into blocks of batch_size
+        (default 10000 for numpy, 1000 for python) that can run on a pool of
+        worker processes; for a given seed the results are identical for any
+        number of workers.
+        
+        With checkpoint, the merged state is written to that shard file every
+        checkpoint_every blocks and at the end. If the file already exists the
+        run resumes after its last completed block, with the same seed streams,
+        so the result is identical to an uninterrupted run.
+        
+        With bracket_store, every sampled bracket is also written, in block
+        order, to that BracketStore file. on_winners, if given, is called in
+        block order with each block's (n x matchups) winner array.
+        """
+        sim_type = "hot (game-by-game)" if hot_simulation else "cold (single matchup)"
+        engine_note = " (vectorized)" if engine == 'numpy' else ""
+        print(f"Running {num_simulations:,} {sim_type} tournament simulations{engine_note}...")
+        
+        if batch_size is None:
+            batch_size = 10000 if engine == 'numpy' else 1000
+        
+        if checkpoint is not None and bracket_store is not None:
+            raise ValueError("A bracket store cannot be resumed from a checkpoint; use one or the other")
+        
+        # Blocks are always merged in order so float sums come out bit-identical
+        totals = empty_stats_state()
+        blocks_done = 0
+        if checkpoint is not None:
+            config = self.shard_config(hot_simulation, engine)
+            if Path(checkpoint).exists():
+                shard = load_shard(checkpoint)
+                self.check_resumable(shard, config, num_simulations, batch_size, seed)
+                totals, blocks_done, seed = shard['state'], shard['blocks_done'], shard['seed']
+                print(f"Resuming from {checkpoint}: {totals['simulations_run']:,} simulations in {blocks_done} blocks")
+            elif seed is None:
+                # Record the entropy so a resumed run continues the same seed streams
+                seed = np.random.SeedSequence().entropy
+        elif bracket_store is not None and seed is None:
+            # Record the entropy so the stored brackets can be regenerated
+            seed = np.random.SeedSequence().entropy
+        
+        blocks = [(size, seq, hot_simulation, engine) for size, seq in self.plan_blocks(num_simulations, batch_size, seed)]
+        
+        def save_checkpoint():
+            write_shard(checkpoint, {
+                'version': SHARD_VERSION, **config,
+                'seed': seed, 'batch_size': batch_size, 'blocks_done': blocks_done,
+                'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'state': stats_state_to_json(totals),
+            })
+        
+        store = None
+        if bracket_store is not None:
+            store = BracketStore.create(bracket_store, {
+                **self.shard_config(hot_simulation, engine), **self.bracket_topology(),
+                'seed': seed, 'batch_size': batch_size, 'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            })
+        
+        # Workers get a copy of the simulator, so the flags are set before the pool starts
+        self.store_brackets = store is not None
+        self.return_winners = on_winners is not None
+        pool = self.open_worker_pool(min(workers, len(blocks) - blocks_done))
+        try:
+            for state in self.execute_blocks(blocks[blocks_done:], pool):
+                if store is not None:
+                    with self.profiler.phase('store_brackets'):
+                        store.append(state.pop('brackets'))
+                if on_winners is not None:
+                    on_winners(state.pop('winners'))
+                with self.profiler.phase('merge'):
+                    merge_stats_states(totals, state)
+                blocks_done += 1
+                if checkpoint is not None and (blocks_done % checkpoint_every == 0 or blocks_done == len(blocks)):
+                    with self.profiler.phase('checkpoint'):
+                        save_checkpoint()
+                if verbose:
+                    print(f"  Completed {totals['simulations_run']:,} simulations...")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            if store is not None:
+                store.close()
+            self.store_brackets = self.return_winners = False
+        
+        self.reset_stats()
+        self.load_stats_state(totals)
+        print(f"Simulation complete!")
+        if checkpoint is not None:
+            print(f"Shard written to {checkpoint}")
+        if store is not None:
+            print(f"{store.count:,} brackets stored in {bracket_store}")
+        
+        if hot_simulation and self.use_series_cache and engine == 'python' and pool is None:
+            self.print_series_cache_stats()
+    
+    def check_resumable(self, shard, config, num_simulations, batch_size, seed):
+        """Raise ValueError unless a checkpoint can be continued by this run."""
+        if shard.get('blocks_done') is None:
+            raise ValueError("This shard was produced by merging and cannot be resumed")
+        for key, value in config.items():
+            if shard[key] != value:
+                raise ValueError(f"Checkpoint {key} ({shard[key]}) does not match this run ({value})")
+        if shard['batch_size'] != batch_size:
+            raise ValueError(f"Checkpoint batch size ({shard['batch_size']}) does not match this run ({batch_size})")
+        if seed is not None and seed != shard['seed']:
+            raise ValueError(f"Checkpoint seed ({shard['seed']}) does not match --seed ({seed})")
+        # The checkpointed blocks must be exactly this run's first blocks
+        done = shard['state']['simulations_run']
+        if done > num_simulations or done != min(shard['blocks_done'] * batch_size, num_simulations):
+            raise ValueError(f"Checkpoint holds {done:,} simulations, which does not line up with "
+                             f"the blocks of a {num_simulations:,}-simulation run")
+    
+    def merge_shards(self, filenames):
+        """
+        Combine shards from separate runs or machines into this simulator's
+        statistics. All shards must share the bracket fingerprint, mode and
+        K-factor; the engines sample the same distribution, so they may differ.
+        Returns the merged shard (not resumable).
+        """
+        totals = empty_stats_state()
+        reference = None
+        seeds = Counter()
+        engines = set()
+        for filename in filenames:
+            shard = load_shard(filename)
+            config = {key: shard[key] for key in ('mode', 'k_factor', 'fingerprint')}
+            if config['fingerprint'] != self.bracket_fingerprint():
+                raise ValueError(f"Shard {filename} was produced from a different bracket or ratings")
+            if reference is None:
+                reference = config
+            elif config != reference:
+                raise ValueError(f"Shard {filename} settings {config} do not match {reference}")
+            seeds[repr(shard.get('seed'))] += 1
+            engines.add(shard['engine'])
+            merge_stats_states(totals, shard['state'])
+            print(f"  {filename}: {shard['state']['simulations_run']:,} simulations")
+        
+        for seed, count in seeds.items():
+            if count > 1 and seed != 'None':
+                print(f"Warning: {count} shards share seed {seed}; their samples overlap")
+        
+        self.reset_stats()
+        self.load_stats_state(totals)
+        print(f"Merged {len(filenames)} shards: {totals['simulations_run']:,} simulations")
+        return {
+            'version': SHARD_VERSION, **reference,
+            'engine': engines.pop() if len(engines) == 1 else 'mixed',
+            'seed': None, 'batch_size': None, 'blocks_done': None,
+            'sources': [str(f) for f in filenames],
+            'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'state': stats_state_to_json(totals),
+        }
+    
+    def widest_confidence_interval(self, top_k=20):
+        """
+        Largest CI half-width among the top-K championship probabilities and the
+        top-K probabilities of every round. This is what adaptive runs drive down.
+        """
+        widest = 0.0
+        counters = [self.championship_wins] + [self.round_reaches[round_num] for round_num, lo, hi in self.round_ranges]
+        for counter in counters:
+            for team_id, count in counter.most_common(top_k):
+                widest = max(widest, self.confidence_half_width(count))
+        return widest
+    
+    def run_until_converged(self, precision=0.001, top_k=20, max_simulations=1000000, verbose=False,
+                            hot_simulation=True, engine='numpy', batch_size=None, workers=1, seed=None):
+        """
+        Simulate in rounds of blocks until every top-K championship and round
+        probability has a confidence half-width of at most `precision`
+        (0.001 = +/-0.1 percentage points), or max_simulations is reached.
+        Blocks use the same seed streams as run_simulation, so stopping after
+        M simulations gives exactly the result of a fixed M-simulation run.
+        """
+        if max_simulations <= 0:
+            raise ValueError(f"max_simulations must be positive, got {max_simulations}")
+        sim_type = "hot (game-by-game)" if hot_simulation else "cold (single matchup)"
+        print(f"Running {sim_type} simulations until top-{top_k} odds are within "
+              f"+/-{precision:.3%} ({self.confidence:.0%} confidence, at most {max_simulations:,})...")
+        
+        if batch_size is None:
+            batch_size = 10000 if engine == 'numpy' else 1000
+        seed_root = np.random.SeedSequence(seed)
+        blocks_per_step = max(1, workers)
+        
+        totals = empty_stats_state()
+        pool = self.open_worker_pool(workers)
+        try:
+            while totals['simulations_run'] < max_simulations:
+                remaining = max_simulations - totals['simulations_run']
+                sizes = [min(batch_size, remaining - start) for start in range(0, remaining, batch_size)][:blocks_per_step]
+                blocks = [(size, seq, hot_simulation, engine) for size, seq in zip(sizes, seed_root.spawn(len(sizes)))]
+                for state in self.execute_blocks(blocks, pool):
+                    with self.profiler.phase('merge'):
+                        merge_stats_states(totals, state)
+                
+                self.reset_stats()
+                self.load_stats_state(totals)
+                widest = self.widest_confidence_interval(top_k)
+                if verbose:
+                    print(f"  {totals['simulations_run']:,} simulations: widest top-{top_k} CI +/-{widest:.3%}")
+                if widest <= precision:
+                    break
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        self.reset_stats()
+        self.load_stats_state(totals)
+        status = "converged" if widest <= precision else "stopped at the simulation cap"
+        print(f"Simulation complete! {status} after {self.simulations_run:,} simulations "
+              f"(widest top-{top_k} CI +/-{widest:.3%})")
+    
+    def run_importance_block(self, num_simulations, seed_sequence, hot_simulation, team, tilt_prob):
+        """
+        Simulate one block tilted toward one team (see ImportanceTilt) and return
+        that team's per-round sums of likelihood-ratio-weighted round indicators
+        and of their squares. The simulator's statistics are left untouched.
+        """
+        saved = self.get_stats_state()
+        self.load_stats_state(empty_stats_state())
+        try:
+            rng = np.random.default_rng(seed_sequence)
+            tilt = ImportanceTilt(team, tilt_prob, num_simulations, len(self.round_ranges))
+            simulate_batch = self.simulate_tournaments_hot if hot_simulation else self.simulate_tournaments_cold
+            winners = simulate_batch(num_simulations, rng, tilt=tilt)
+        finally:
+            self.load_stats_state(saved)
+        
+        # Reaching round r depends only on the team's results up to r, so later tilts are not weighed in
+        weights = np.exp(np.cumsum(tilt.log_weights, axis=1))
+        reached = np.stack([(winners[:, lo:hi] == team).any(axis=1) for _, lo, hi in self.round_ranges], axis=1)
+        weighted = np.where(reached, weights, 0.0)
+        return {
+            'simulations': num_simulations,
+            'weight_sum': weighted.sum(axis=0),
+            'weight_sq_sum': np.square(weighted).sum(axis=0),
+        }
+    
+    def run_long_shot_odds(self, team_ids, num_simulations=20000, hot_simulation=True, tilt_prob=None,
+                           batch_size=10000, workers=1, seed=None):
+        """
+        Importance-sampled round and championship odds for long shots. Each team
+        gets num_simulations brackets of its own in which it wins each matchup
+        (cold) or game (hot) with probability at least tilt_prob, and every
+        bracket counts with its likelihood ratio, so the estimates stay unbiased
+        for the untilted model while a team that rarely wins is seen winning
+        often. tilt_prob defaults to 1.0 cold (the team always advances) and 0.7
+        hot. Stores and returns long_shot_odds: team_id -> per-round arrays
+        (in round order) of probabilities, CI half-widths and effective samples.
+        """
+        if tilt_prob is None:
+            tilt_prob = 0.7 if hot_simulation else 1.0
+        if hot_simulation and tilt_prob >= 1.0:
+            raise ValueError("A hot tilt must stay below 1: forced sweeps would leave longer series unsampled")
+        
+        # Each team has its own seed streams, apart from the blocks of the plain run
+        entropy = np.random.SeedSequence(seed).entropy
+        blocks, block_teams = [], []
+        for team_id in team_ids:
+            team = self.team_index[team_id]
+            root = np.random.SeedSequence(entropy, spawn_key=(IMPORTANCE_SPAWN_KEY, team))
+            for size, seq in self.plan_blocks(num_simulations, batch_size, root):
+                blocks.append((size, seq, hot_simulation, team, tilt_prob))
+                block_teams.append(team_id)
+        sim_type = "hot" if hot_simulation else "cold"
+        print(f"Running {num_simulations:,} {sim_type} importance-sampled simulations for each of "
+              f"{len(team_ids)} long shots (tilt {tilt_prob:.2f})...")
+        
+        totals = {team_id: {'simulations': 0, 'weight_sum': 0.0, 'weight_sq_sum': 0.0} for team_id in team_ids}
+        pool = self.open_worker_pool(min(workers, len(blocks)))
+        try:
+            for team_id, result in zip(block_teams, self.execute_blocks(blocks, pool, method='run_importance_block')):
+                for key, value in result.items():
+                    totals[team_id][key] = totals[team_id][key] + value
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        self.long_shot_odds = {}
+        for team_id, total in totals.items():
+            n = total['simulations']
+            probabilities = total['weight_sum'] / n
+            variances = np.maximum(total['weight_sq_sum'] / n - probabilities ** 2, 0.0) / n
+            with np.errstate(divide='ignore', invalid='ignore'):
+                effective = np.where(total['weight_sq_sum'] > 0, total['weight_sum'] ** 2 / total['weight_sq_sum'], 0.0)
+            self.long_shot_odds[team_id] = {
+                'simulations': n,
+                'probabilities': probabilities,
+                'ci': self.confidence_z * np.sqrt(variances),
+                'effective_samples': effective,
+            }
+        return self.long_shot_odds
+
+    def run_sweep_block(self, num_simulations, seed_sequence, configs):
+        """
+        Run one block of every sweep configuration on the same random draws
+        (common random numbers). Each (tournament, matchup, game) slot gets one
+        uniform that every configuration uses, so differences between
+        configurations come from the settings rather than from the draws.
+        Returns one stats state per configuration.
+        """
+        rng = np.random.default_rng(seed_sequence)
+        uniforms = rng.random((num_simulations, len(self.matchup_ids), 7))
+        # Sampled ratings are shared the same way
+        elos = self.sample_team_elos(num_simulations, rng)
+        
+        base_k_factor = self.k_factor
+        states = []
+        try:
+            for hot_simulation, k_factor in configs:
+                self.k_factor = k_factor
+                self.reset_stats()
+                simulate_batch = self.simulate_tournaments_hot if hot_simulation else self.simulate_tournaments_cold
+                self.record_batch_results(simulate_batch(num_simulations, rng, uniforms, elos=elos))
+                self.simulations_run = num_simulations
+                states.append(self.get_stats_state())
+        finally:
+            self.k_factor = base_k_factor
+        return states
+    
+    def run_sweep(self, k_factors, modes=('hot', 'cold'), num_simulations=10000, verbose=False,
+                  batch_size=2000, workers=1, seed=None):
+        """
+        Evaluate a grid of K-factors and hot/cold settings in one pass over shared
+        random draws. K only matters for hot mode, so cold runs once.
+        Returns a long DataFrame of results keyed by a 'config' column.
+        """
+        configs = []
+        if 'hot' in modes:
+            configs.extend((True, k) for k in k_factors)
+        if 'cold' in modes:
+            configs.append((False, self.k_factor))
+        labels = [f"hot_k{k}" if hot else "cold" for hot, k in configs]
+        print(f"Running {num_simulations:,} simulations for {len(configs)} configurations "
+              f"on common random numbers: {', '.join(labels)}")
+        
+        blocks = [(size, seq, configs) for size, seq in self.plan_blocks(num_simulations, batch_size, seed)]
+        totals = [empty_stats_state() for _ in configs]
+        pool = self.open_worker_pool(min(workers, len(blocks)))
+        try:
+            for states in self.execute_blocks(blocks, pool, method='run_sweep_block'):
+                for total, state in zip(totals, states):
+                    merge_stats_states(total, state)
+                if verbose:
+                    print(f"  Completed {totals[0]['simulations_run']:,} simulations...")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        frames = []
+        for label, (hot_simulation, k_factor), total in zip(labels, configs, totals):
+            self.reset_stats()
+            self.load_stats_state(total)
+            frame = self.build_results_frame()
+            frame.insert(0, 'k_factor', k_factor if hot_simulation else None)
+            frame.insert(0, 'mode', 'hot' if hot_simulation else 'cold')
+            frame.insert(0, 'config', label)
+            frames.append(frame)
+        print(f"Sweep complete!")
+        return pd.concat(frames, ignore_index=True)
+    
+    def print_sweep_results(self, sweep_df, show_top_n=20):
+        """Print championship odds side by side for every sweep configuration."""
+        table = sweep_df.pivot_table(index=['team_id', 'username'], columns='config',
+                                     values='championship_probability', sort=False)
+        table = table[list(dict.fromkeys(sweep_df['config']))]  # keep configuration order
+        baseline = table.columns[0]
+        table = table.sort_values(baseline, ascending=False).head(show_top_n)
+        
+        print(f"\n{'='*80}")
+        print(f"PARAMETER SWEEP - CHAMPIONSHIP ODDS (Top {show_top_n} by {baseline})")
+        print(f"{'='*80}")
+        print(f"{'Username':<20} " + " ".join(f"{c:>12}" for c in table.columns))
+        print("-" * (21 + 13 * len(table.columns)))
+        for (team_id, username), row in table.iterrows():
+            print(f"{username:<20} " + " ".join(f"{p:>12.3%}" for p in row))
+    
+    def pickem_scorer(self, entries_df, round_points, places=10):
+        """
+        Build a PickemScorer for bracket-pool entries given one row per pick
+        (entry_id, matchup_id, team_id). round_points maps each round number to
+        the points a correct pick in that round is worth.
+        """
+        entry_ids = list(pd.unique(entries_df['entry_id']))
+        entry_index = {entry_id: i for i, entry_id in enumerate(entry_ids)}
+        picks = np.full((len(entry_ids), len(self.matchup_ids)), -1, dtype=np.int32)
+        for entry_id, matchup_id, team_id in zip(entries_df['entry_id'], entries_df['matchup_id'], entries_df['team_id']):
+            i = self.matchup_index.get(matchup_id)
+            if i is None:
+                raise ValueError(f"Entry {entry_id} picks matchup {matchup_id}, which is not in this bracket")
+            team_index = self.team_index.get(team_id)
+            if team_index is None:
+                raise ValueError(f"Entry {entry_id} picks team {team_id}, which is not in this tournament")
+            picks[entry_index[entry_id], i] = team_index
+        
+        missing = sorted(set(self.rounds) - set(round_points))
+        if missing:
+            raise ValueError(f"No pick'em points given for round(s) {missing}")
+        points = np.array([round_points[round_num] for round_num in self.matchup_rounds], dtype=np.float64)
+        return PickemScorer(entry_ids, picks, points, places)
+    
+    def score_bracket_store(self, scorer, store, chunk_size=100000):
+        """Score a pick'em pool against the brackets saved in a BracketStore instead of simulating."""
+        if list(store.team_ids) != list(self.team_ids) or list(store.matchup_ids) != list(self.matchup_ids):
+            raise ValueError(f"{store.filename} was written for a different bracket")
+        print(f"Scoring against {len(store):,} stored {store.header['mode']} brackets from {store.filename}...")
+        for winners in store.iter_winners(chunk_size):
+            scorer.add(winners)
+    
+    def print_pickem_results(self, pickem_df, show_top_n=20):
+        """Print the leading bracket-pool entries."""
+        print(f"\n{'='*80}")
+        print(f"PICK'EM POOL ({len(pickem_df):,} entries, top {show_top_n} by win probability)")
+        print(f"{'='*80}")
+        ci_label = f"{self.confidence:.0%} CI"
+        print(f"{'Rank':<4} {'Entry':<24} {'Exp. score':>10} {'Std':>8} {'Win prob':>10} {ci_label:>10} {'Mean place':>11}")
+        print("-" * 84)
+        for i, row in enumerate(pickem_df.head(show_top_n).itertuples(index=False), 1):
+            print(f"{i:<4} {str(row.entry_id):<24} {row.expected_score:>10.1f} {row.score_std:>8.1f} "
+                  f"{row.win_probability:>10.3%} {'+/-' + format(row.win_ci, '.3%'):>10} {row.mean_place:>11.1f}")
+    
+    def rating_spreads(self):
+        """Per-team SD of the starting ELO draws (by team index), or None when ratings are exact."""
+        if self.rating_uncertainty is None:
+            return None
+        # Teams with no recorded matches count as one, which keeps the spread finite
+        return self.rating_uncertainty / np.sqrt(np.maximum(self.matches_played, 1.0))
+    
+    def sample_team_elos(self, num_tournaments, rng):
+        """
+        Draw every team's starting ELO for a batch of tournaments in one go:
+        an (num_tournaments x teams) array, normal around the ratings with the
+        spreads of rating_spreads. Returns None when ratings are treated as exact.
+        """
+        spreads = self.rating_spreads()
+        if spreads is None:
+            return None
+        # Single precision keeps the draw cheap; the spread dwarfs the rounding
+        elos = rng.standard_normal((num_tournaments, len(self.team_ids)), dtype=np.float32)
+        elos *= spreads.astype(np.float32)
+        elos += self.base_elos.astype(np.float32)
+        return elos
+    
+    def gather_round_teams(self, winners, round_num, lo, hi):
+        """Return the (team1, team2) index arrays for one round of a batch."""
+        n = len(winners)
+        if round_num == 1:
+            team1 = np.broadcast_to(self.first_round_teams[lo:hi, 0], (n, hi - lo))
+            team2 = np.broadcast_to(self.first_round_teams[lo:hi, 1], (n, hi - lo))
+        else:
+            feeder1, feeder2 = self.feeders[lo:hi, 0], self.feeders[lo:hi, 1]
+            team1 = np.where(feeder1 >= 0, winners[:, np.maximum(feeder1, 0)], -1)
+            team2 = np.where(feeder2 >= 0, winners[:, np.maximum(feeder2, 0)], -1)
+        return team1, team2
+    
+    def record_upsets(self, round_num, upset_diffs):
+        """Add the ELO gaps (loser minus winner) of one round's upsets to the summary."""
+        if len(upset_diffs) == 0:
+            return
+        self.upset_summary['total'] += len(upset_diffs)
+        self.upset_summary['by_round'][round_num] += len(upset_diffs)
+        self.upset_summary['elo_diff_sum'] += float(upset_diffs.sum())
+        self.upset_summary['max_elo_diff'] = max(self.upset_summary['max_elo_diff'], float(upset_diffs.max()))
+    
+    def simulate_tournaments_cold(self, num_tournaments, rng, uniforms=None, tilt=None, elos=None):
+        """
+        Simulate a batch of cold tournaments at once, one round at a time.
+        uniforms, if given, is a shared (num_tournaments x matchups x 7) array of
+        draws (see run_sweep_block); each matchup uses its first one.
+        tilt, if given, is an ImportanceTilt that biases its team's matchups.
+        elos, if given, holds each tournament's team ratings (see sample_team_elos);
+        by default they are drawn here when rating_uncertainty is set.
+        Returns an (num_tournaments x matchups) array of winner team indices (-1 = no winner).
+        """
+        n = num_tournaments
+        winners = np.full((n, len(self.matchup_ids)), -1, dtype=np.int32)
+        if elos is None:
+            elos = self.sample_team_elos(n, rng)
+        if elos is not None:
+            # Winners carry their sampled rating up the bracket (as in the hot engine), so
+            # only the first round gathers from the whole (n x teams) table
+            winner_elos = np.zeros((n, len(self.matchup_ids)), dtype=elos.dtype)
+        
+        for round_pos, (round_num, lo, hi) in enumerate(self.round_ranges):
+            with self.profiler.round(round_num):
+                team1, team2 = self.gather_round_teams(winners, round_num, lo, hi)
+                
+                # One draw per matchup against the precomputed win probability matrix
+                if elos is None:
+                    prob_team1_wins = self.win_prob_matrix[np.maximum(team1, 0), np.maximum(team2, 0)]
+                else:
+                    if round_num == 1:
+                        elo1 = elos[:, np.maximum(self.first_round_teams[lo:hi, 0], 0)]
+                        elo2 = elos[:, np.maximum(self.first_round_teams[lo:hi, 1], 0)]
+                    else:
+                        elo1 = winner_elos[:, np.maximum(self.feeders[lo:hi, 0], 0)]
+                        elo2 = winner_elos[:, np.maximum(self.feeders[lo:hi, 1], 0)]
+                    # Sampled ratings are fractional, so the lookup table would not help
+                    prob_team1_wins = 1.0 / (1.0 + np.power(10.0, (elo2 - elo1) / 400.0))
+                draw_probs = prob_team1_wins
+                if tilt is not None:
+                    tilt.begin(round_pos, np.broadcast_to(np.arange(n)[:, None], team1.shape), team1, team2)
+                    draw_probs = tilt.adjust(prob_team1_wins)
+                draws = uniforms[:, lo:hi, 0] if uniforms is not None else rng.random(team1.shape)
+                team1_wins = draws < draw_probs
+                winner = np.where(team2 < 0, team1, np.where(team1 < 0, team2, np.where(team1_wins, team1, team2)))
+                locked = self.locked_winners[lo:hi]
+                winner = np.where(locked >= 0, locked, winner)
+                winners[:, lo:hi] = winner
+                if elos is not None:
+                    carried = np.where(winner == team1, elo1, elo2)
+                    if (locked >= 0).any():
+                        # A recorded winner the sampled bracket did not send here brings its own rating
+                        stray = (locked >= 0) & (winner != team1) & (winner != team2)
+                        carried = np.where(stray, elos[:, np.maximum(locked, 0)], carried)
+                    winner_elos[:, lo:hi] = carried
+                
+                # Upsets: the lower-rated team won a real (non-bye), undecided matchup
+                both = (team1 >= 0) & (team2 >= 0) & (locked < 0)
+                if tilt is not None:
+                    tilt.record(prob_team1_wins, draw_probs, team1_wins, both)
+                loser = np.where(team1_wins, team2, team1)
+                elo_diff = self.base_elos[np.maximum(loser, 0)] - self.base_elos[np.maximum(winner, 0)]
+                self.record_upsets(round_num, elo_diff[both & (elo_diff > 0)])
+                played = int(both.sum())
+                self.profiler.count('series', played, round_num)
+                self.profiler.count('games', played, round_num)
+        
+        return winners
+    
+    def simulate_series_batch(self, team1_elo, team2_elo, rng, game_uniforms=None, tilt=None):
+        """
+        Play best-of-7 series for 1-D arrays of starting ELOs, all series advancing
+        one game at a time. Reproduces update_elo_ratings exactly: both teams start
+        at 10 games played, K adapts per game and ELOs are rounded after every game.
+        game_uniforms, if given, is a (series x 7) array of pre-drawn game draws.
+        tilt, if given, is an ImportanceTilt aimed at these series (see
+        simulate_tournaments_hot); it biases the draws, never the ELO updates.
+        Returns (team1_won_series, final_team1_elo, final_team2_elo, games_played).
+        """
+        elo1 = team1_elo.astype(np.float64)
+        elo2 = team2_elo.astype(np.float64)
+        wins1 = np.zeros(len(elo1), dtype=np.int8)
+        wins2 = np.zeros(len(elo1), dtype=np.int8)
+        
+        for game in range(7):
+            active = (wins1 < 4) & (wins2 < 4)
+            if not active.any():
+                break
+            
+            # Both teams have played the same number of games, so they share one K
+            k = self.calculate_adaptive_k_factor(self.k_factor, 1.0, 10 + game)
+            
+            prob_team1, prob_team2 = win_probabilities(elo1, elo2)
+            draw_probs = prob_team1 if tilt is None else tilt.adjust(prob_team1)
+            draws = game_uniforms[:, game] if game_uniforms is not None else rng.random(len(elo1))
+            team1_wins_game = draws < draw_probs
+            if tilt is not None:
+                tilt.record(prob_team1, draw_probs, team1_wins_game, active)
+            
+            # Same arithmetic as update_elo_ratings, seen from the winner's side
+            winner_expected = np.where(team1_wins_game, prob_team1, prob_team2)
+            loser_expected = 1.0 - winner_expected
+            winner_delta = k * (1.0 - winner_expected)
+            loser_delta = k * (0.0 - loser_expected)
+            new_elo1 = np.rint(elo1 + np.where(team1_wins_game, winner_delta, loser_delta))
+            new_elo2 = np.rint(elo2 + np.where(team1_wins_game, loser_delta, winner_delta))
+            
+            elo1 = np.where(active, new_elo1, elo1)
+            elo2 = np.where(active, new_elo2, elo2)
+            wins1 += active & team1_wins_game
+            wins2 += active & ~team1_wins_game
+        
+        return wins1 == 4, elo1, elo2, (wins1 + wins2).astype(np.int64)
+    
+    def record_series(self, initial_elo1, initial_elo2, final_elo1, final_elo2, games_played):
+        """Add a batch of finished series to the series summary."""
+        if len(games_played) == 0:
+            return
+        swings = np.concatenate([np.abs(final_elo1 - initial_elo1), np.abs(final_elo2 - initial_elo2)])
+        lengths = np.bincount(games_played, minlength=8)
+        for length in np.flatnonzero(lengths):
+            self.series_summary['length_counts'][int(length)] += int(lengths[length])
+        self.series_summary['total'] += len(games_played)
+        self.series_summary['elo_swing_sum'] += float(swings.sum())
+        self.series_summary['max_elo_swing'] = max(self.series_summary['max_elo_swing'], float(swings.max()))
+    
+    def simulate_tournaments_hot(self, num_tournaments, rng, uniforms=None, tilt=None, elos=None):
+        """
+        Simulate a batch of hot tournaments at once. Every series in a round is
+        played together across all tournaments, and each winner carries its
+        post-series ELO into the next round (as simulate_matchup does).
+        uniforms, if given, is a shared (num_tournaments x matchups x 7) array of
+        game draws (see run_sweep_block). tilt, if given, is an ImportanceTilt
+        that biases the games its team plays. elos, if given, holds each
+        tournament's starting ratings (see sample_team_elos); by default they are
+        drawn here when rating_uncertainty is set.
+        Returns an (num_tournaments x matchups) array of winner team indices (-1 = no winner).
+        """
+        n = num_tournaments
+        winners = np.full((n, len(self.matchup_ids)), -1, dtype=np.int32)
+        winner_elos = np.zeros((n, len(self.matchup_ids)), dtype=np.float64)
+        if elos is None:
+            elos = self.sample_team_elos(n, rng)
+        
+        def starting_elos(teams):
+            """Ratings the teams of an (n x matchups) index array start the tournament with."""
+            teams = np.maximum(teams, 0)
+            return self.base_elos[teams] if elos is None else np.take_along_axis(elos, teams, axis=1)
+        
+        for round_pos, (round_num, lo, hi) in enumerate(self.round_ranges):
+            with self.profiler.round(round_num):
+                team1, team2 = self.gather_round_teams(winners, round_num, lo, hi)
+                if round_num == 1:
+                    elo1 = starting_elos(team1)
+                    elo2 = starting_elos(team2)
+                else:
+                    feeder1, feeder2 = self.feeders[lo:hi, 0], self.feeders[lo:hi, 1]
+                    elo1 = winner_elos[:, np.maximum(feeder1, 0)]
+                    elo2 = winner_elos[:, np.maximum(feeder2, 0)]
+                
+                # Byes pass the present team through with its ELO untouched
+                winner = np.where(team2 < 0, team1, team2)
+                winner_elo = np.where(team2 < 0, elo1, elo2)
+                
+                # Completed matchups are not played: the recorded winner advances with the ELO it carried in
+                locked = self.locked_winners[lo:hi]
+                if (locked >= 0).any():
+                    locked_elo = np.where(locked == team1, elo1,
+                                          np.where(locked == team2, elo2, starting_elos(np.broadcast_to(locked, team1.shape))))
+                    winner = np.where(locked >= 0, locked, winner)
+                    winner_elo = np.where(locked >= 0, locked_elo, winner_elo)
+                
+                both = (team1 >= 0) & (team2 >= 0) & (locked < 0)
+                if both.any():
+                    e1, e2 = elo1[both], elo2[both]
+                    game_uniforms = uniforms[:, lo:hi][both] if uniforms is not None else None
+                    if tilt is not None:
+                        tilt.begin(round_pos, np.nonzero(both)[0], team1[both], team2[both])
+                    team1_won, final1, final2, games = self.simulate_series_batch(e1, e2, rng, game_uniforms, tilt)
+                    winner[both] = np.where(team1_won, team1[both], team2[both])
+                    winner_elo[both] = np.where(team1_won, final1, final2)
+                    
+                    # Upsets are judged on the ELOs the teams carried into the series
+                    elo_diff = np.where(team1_won, e2 - e1, e1 - e2)
+                    self.record_upsets(round_num, elo_diff[elo_diff > 0])
+                    self.record_series(e1, e2, final1, final2, games)
+                    self.profiler.count('series', len(games), round_num)
+                    self.profiler.count('games', games.sum(), round_num)
+                
+                winners[:, lo:hi] = winner
+                winner_elos[:, lo:hi] = winner_elo
+        
+        return winners
+    
+    def record_batch_results(self, winners):
+        """Fold a batch of winner arrays into the championship/round/alive counters."""
+        num_teams = len(self.team_ids)
+        champions = winners[:, self.final_matchup]
+        
+        # Only tournaments that produced a champion are counted (same as the python loop)
+        has_champion = champions >= 0
+        if not has_champion.all():
+            winners = winners[has_champion]
+            champions = champions[has_champion]
+        num_counted = len(champions)
+        
+        def add_counts(counter, counts):
+            for i in np.flatnonzero(counts):
+                counter[self.team_ids[i]] += int(counts[i])
+        
+        add_counts(self.championship_wins, np.bincount(champions, minlength=num_teams))
+        
+        first_round_teams = self.first_round_teams.ravel()
+        first_round_teams = first_round_teams[first_round_teams >= 0]
+        add_counts(self.teams_alive[1], np.bincount(first_round_teams, minlength=num_teams) * num_counted)
+        
+        for round_num, lo, hi in self.round_ranges:
+            round_winners = winners[:, lo:hi].ravel()
+            counts = np.bincount(round_winners[round_winners >= 0], minlength=num_teams)
+            add_counts(self.round_reaches[round_num], counts)
+            if round_num < self.max_round:
+                add_counts(self.teams_alive[round_num + 1], counts)
+            
+            # A user counts once per tournament however many of their teams won a matchup this round;
+            # empty matchups mark a spare last column
+            num_users = len(self.usernames)
+            round_winners = winners[:, lo:hi]
+            users = np.where(round_winners >= 0, self.team_users[np.maximum(round_winners, 0)], num_users)
+            has_team = np.zeros((num_counted, num_users + 1), dtype=bool)
+            np.put_along_axis(has_team, users, True, axis=1)
+            user_counts = np.count_nonzero(has_team[:, :num_users], axis=0)
+            for i in np.flatnonzero(user_counts):
+                self.user_round_reaches[round_num][self.usernames[i]] += int(user_counts[i])
+        
+        if self.track_meetings:
+            for round_num, lo, hi in self.round_ranges:
+                self.record_meetings(round_num, *self.gather_round_teams(winners, round_num, lo, hi))
+    
+    def record_meetings(self, round_num, team1, team2):
+        """Count the pairs of one round of a batch (team index arrays, -1 = bye) into meetings."""
+        met = (team1 >= 0) & (team2 >= 0)
+        num_teams = len(self.team_ids)
+        pairs, counts = np.unique(team1[met].astype(np.int64) * num_teams + team2[met], return_counts=True)
+        for pair, count in zip(pairs.tolist(), counts.tolist()):
+            team1_id, team2_id = self.team_ids[pair // num_teams], self.team_ids[pair % num_teams]
+            self.meetings[(round_num, team1_id)][team2_id] += count
+            self.meetings[(round_num, team2_id)][team1_id] += count
+    
+    def combine_winner_distributions(self, side1, side2):
+        """
+        Combine the winner distributions of the two slots of a matchup into the
+        distribution of the matchup's winner. Each distribution is a pair of
+        (team indices, probabilities); an empty side is a bye.
+        """
+        teams1, probs1 = side1
+        teams2, probs2 = side2
+        if len(teams2) == 0:
+            return side1
+        if len(teams1) == 0:
+            return side2
+        
+        # P(i wins) = P(i reaches) * sum_j P(j reaches) * P(i beats j)
+        win1 = probs1 * (self.win_prob_matrix[np.ix_(teams1, teams2)] @ probs2)
+        win2 = probs2 * (self.win_prob_matrix[np.ix_(teams2, teams1)] @ probs1)
+        return np.concatenate([teams1, teams2]), np.concatenate([win1, win2])
+    
+    def compute_exact_odds(self, changed=None):
+        """
+        Compute cold-mode odds exactly by dynamic programming up the bracket.
+        Each matchup's winner distribution is built from its two feeders, so the
+        results have no sampling noise. They are stored in the usual counters as
+        probabilities (simulations_run = 1), so reporting and export work unchanged.
+        
+        Completed matchups contribute their recorded winner with probability 1.
+        If changed lists matchup indices whose result changed since the last call,
+        only those matchups and the path above them are recomputed; every other
+        subtree keeps its cached distribution.
+        """
+        if self.rating_uncertainty is not None:
+            raise ValueError("Exact odds treat ratings as exact; sample them with a simulation run instead")
+        distributions = self.winner_distributions
+        if changed is None or len(distributions) != len(self.matchup_ids):
+            dirty = None
+            distributions = [None] * len(self.matchup_ids)
+        else:
+            dirty = set()
+            for i in changed:
+                while i >= 0 and i not in dirty:
+                    dirty.add(int(i))
+                    i = self.parent_index[i]
+        
+        self.reset_stats()
+        empty = (np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64))
+        
+        def point_mass(team_index):
+            if team_index < 0:
+                return empty
+            return np.array([team_index], dtype=np.int32), np.ones(1)
+        
+        for round_num, lo, hi in self.round_ranges:
+            for i in range(lo, hi):
+                if dirty is not None and i not in dirty:
+                    continue
+                if self.locked_winners[i] >= 0:
+                    distributions[i] = point_mass(self.locked_winners[i])
+                    continue
+                if round_num == 1:
+                    side1 = point_mass(self.first_round_teams[i, 0])
+                    side2 = point_mass(self.first_round_teams[i, 1])
+                else:
+                    feeder1, feeder2 = self.feeders[i]
+                    side1 = distributions[feeder1] if feeder1 >= 0 else empty
+                    side2 = distributions[feeder2] if feeder2 >= 0 else empty
+                distributions[i] = self.combine_winner_distributions(side1, side2)
+        distributions = [d if d is not None else empty for d in distributions]
+        self.winner_distributions = distributions
+        
+        num_teams = len(self.team_ids)
+        
+        def add_probabilities(counter, lo, hi):
+            teams = np.concatenate([d[0] for d in distributions[lo:hi]])
+            probs = np.concatenate([d[1] for d in distributions[lo:hi]])
+            totals = np.bincount(teams, weights=probs, minlength=num_teams)
+            for team_index in np.flatnonzero(totals > 0):
+                counter[self.team_ids[team_index]] += float(totals[team_index])
+        
+        add_probabilities(self.championship_wins, self.final_matchup, self.final_matchup + 1)
+        for team_index in self.first_round_teams.ravel():
+            if team_index >= 0:
+                self.teams_alive[1][self.team_ids[team_index]] += 1.0
+        for round_num, lo, hi in self.round_ranges:
+            add_probabilities(self.round_reaches[round_num], lo, hi)
+            if round_num < self.max_round:
+                add_probabilities(self.teams_alive[round_num + 1], lo, hi)
+        
+        # Matchups of one round sit in disjoint subtrees, so in cold mode their winners are
+        # independent; within a matchup a user's teams are mutually exclusive
+        num_users = len(self.usernames)
+        for round_num, lo, hi in self.round_ranges:
+            no_team = np.ones(num_users)
+            for teams, probs in distributions[lo:hi]:
+                no_team *= 1.0 - np.bincount(self.team_users[teams], weights=probs, minlength=num_users)
+            for i in np.flatnonzero(no_team < 1.0):
+                self.user_round_reaches[round_num][self.usernames[i]] += float(1.0 - no_team[i])
+        
+        self.simulations_run = 1
+        self.exact = True
+    
+    def confidence_half_widths(self, counts):
+        """Array version of confidence_half_width."""
+        if self.exact or self.simulations_run == 0:
+            return np.zeros(len(counts))
+        p = counts / self.simulations_run
+        return self.confidence_z * np.sqrt(p * (1.0 - p) / self.simulations_run)
+    
+    def confidence_half_width(self, count):
+        """
+        Half-width of the normal-approximation confidence interval (binomial
+        standard error times z) for a probability estimated as count / simulations_run.
+        """
+        if self.exact or self.simulations_run == 0:
+            return 0.0
+        p = count / self.simulations_run
+        return self.confidence_z * math.sqrt(p * (1.0 - p) / self.simulations_run)
+    
+    @property
+    def confidence_z(self):
+        return NormalDist().inv_cdf(0.5 + self.confidence / 2.0)
+    
+    def get_championship_odds(self, top_n=20):
+        """Get championship odds for all teams, sorted by probability."""
+        if self.simulations_run == 0:
+            return []
+        
+        odds = []
+        for team_id, wins in self.championship_wins.items():
+            probability = wins / self.simulations_run
+            team_data = self.teams[team_id]
+            odds.append({
+                'team_id': team_id,
+                'username': team_data['username'],
+                'championships': wins,
+                'probability': probability,
+                'ci_half_width': self.confidence_half_width(wins),
+                'odds': f"1 in {int(1/probability):.0f}" if probability > 0 else "No wins"
+            })
+        
+        # Sort by probability (highest first)
+        odds.sort(key=lambda x: x['probability'], reverse=True)
+        
+        return odds[:top_n] if top_n else odds
+    
+    def get_round_advancement_odds(self, round_num, top_n=20):
+        """Get odds for teams to reach a specific round."""
+        if self.simulations_run == 0 or round_num not in self.round_reaches:
+            return []
+        
+        odds = []
+        for team_id, reaches in self.round_reaches[round_num].items():
+            probability = reaches / self.simulations_run
+            team_data = self.teams[team_id]
+            odds.append({
+                'team_id': team_id,
+                'username': team_data['username'],
                 'round_reaches': reaches,
-                'probability': probability
+                'probability': probability,
+                'ci_half_width': self.confidence_half_width(reaches)
             })
         
         # Sort by probability (highest first)  
@@ -461,88 +2464,168 @@ class TournamentSimulator:
         
         return odds[:top_n] if top_n else odds
     
-    def get_upset_analysis(self):
-        """Analyze upset frequency and patterns."""
-        if not self.upset_tracker:
+    def exact_meetings(self, team_index):
+        """
+        Exact cold-mode meeting probabilities for one team from the DP winner
+        distributions: {(round_num, opponent_index): probability}. In a bracket
+        two teams can only meet where their paths join, and the two sides of a
+        matchup are independent, so P(meet) = P(team wins its side) * P(opponent
+        wins the other side). Walks one path to the final: O(rounds * teams).
+        """
+        rows, slots = np.nonzero(self.first_round_teams == team_index)
+        if len(rows) == 0:
             return {}
+        i, slot = int(rows[0]), int(slots[0])
+        meetings = {}
+        opponent = self.first_round_teams[i, 1 - slot]
+        if opponent >= 0:
+            meetings[(1, int(opponent))] = 1.0
+        
+        while self.parent_index[i] >= 0:
+            teams, probs = self.winner_distributions[i]
+            reach = probs[teams == team_index].sum()
+            parent, slot = self.parent_index[i], self.parent_slot[i]
+            other_side = self.feeders[parent, 1 - slot]
+            if reach > 0 and other_side >= 0:
+                round_num = int(self.matchup_rounds[parent])
+                for opponent, prob in zip(*self.winner_distributions[other_side]):
+                    meetings[(round_num, int(opponent))] = float(reach * prob)
+            i = parent
+        return meetings
+    
+    def get_meeting_odds(self, team_id, round_num=None, top_n=20):
+        """
+        Probability that team_id faces each opponent, per round (top_n per round).
+        Exact runs derive it from the bracket DP; sampled runs need track_meetings.
+        """
+        if self.simulations_run == 0 or team_id not in self.team_index:
+            return []
         
-        total_upsets = len(self.upset_tracker)
-        upsets_by_round = Counter([upset['round'] for upset in self.upset_tracker])
+        if self.exact:
+            counts = {(r, self.team_ids[opponent]): p
+                      for (r, opponent), p in self.exact_meetings(self.team_index[team_id]).items()}
+        else:
+            counts = {(r, opponent): count for r, lo, hi in self.round_ranges
+                      for opponent, count in self.meetings.get((r, team_id), {}).items()}
         
-        # Calculate average ELO difference in upsets
-        # Use initial ELO if available, otherwise use final ELO
-        elo_diffs = []
-        for upset in self.upset_tracker:
-            if 'loser_initial_elo' in upset and 'winner_initial_elo' in upset:
-                elo_diff = upset['loser_initial_elo'] - upset['winner_initial_elo']
-            else:
-                # Fallback for old format
-                elo_diff = upset.get('loser_elo', 0) - upset.get('winner_elo', 0)
-            elo_diffs.append(elo_diff)
+        by_round = defaultdict(list)
+        for (r, opponent), count in counts.items():
+            if round_num is not None and r != round_num:
+                continue
+            by_round[r].append({
+                'round': r,
+                'opponent_id': opponent,
+                'username': self.teams[opponent]['username'],
+                'meetings': count,
+                'probability': count / self.simulations_run,
+                'ci_half_width': self.confidence_half_width(count)
+            })
         
-        avg_elo_diff = sum(elo_diffs) / len(elo_diffs) if elo_diffs else 0
+        odds = []
+        for r in sorted(by_round):
+            round_odds = sorted(by_round[r], key=lambda x: x['probability'], reverse=True)
+            odds.extend(round_odds[:top_n] if top_n else round_odds)
+        return odds
+    
+    def print_meeting_odds(self, team_id, show_top_n=5):
+        """Print the most likely opponents of one team in each round."""
+        if team_id not in self.teams:
+            print(f"\nUnknown team {team_id}")
+            return
+        print(f"\n{'='*80}")
+        print(f"LIKELY OPPONENTS - {self.teams[team_id]['username']} ({team_id})")
+        print(f"{'='*80}")
+        if not self.exact and not self.track_meetings:
+            print("Meeting counts were not tracked in this run")
+            return
+        current_round = None
+        for entry in self.get_meeting_odds(team_id, top_n=show_top_n):
+            if entry['round'] != current_round:
+                current_round = entry['round']
+                print(f"\nRound {current_round}:")
+            print(f"  vs {entry['username']:<20} {entry['opponent_id']:<40} "
+                  f"{entry['probability']:<12.3%} +/-{entry['ci_half_width']:.3%}")
+    
+    def print_long_shot_odds(self, show_top_n=20):
+        """Print the importance-sampled championship odds next to the plain estimates."""
+        if not self.long_shot_odds:
+            return
+        simulations = next(iter(self.long_shot_odds.values()))['simulations']
+        print(f"\n{'='*80}")
+        print(f"LONG-SHOT CHAMPIONSHIP ODDS (importance sampling, {simulations:,} tilted brackets per team)")
+        print(f"{'='*80}")
+        ci_label = f"{self.confidence:.0%} CI"
+        print(f"{'Username':<20} {'Team ID':<40} {'ELO':<8} {'Probability':<12} {ci_label:<12} "
+              f"{'Odds':<16} {'Plain':<10} {'Var. cut'}")
+        print("-" * 130)
+        
+        rows = sorted(self.long_shot_odds.items(), key=lambda item: item[1]['probabilities'][-1], reverse=True)
+        for team_id, result in rows[:show_top_n]:
+            probability, ci = result['probabilities'][-1], result['ci'][-1]
+            odds = f"1 in {1 / probability:,.0f}" if probability > 0 else "No path"
+            plain = self.championship_wins.get(team_id, 0) / self.simulations_run if self.simulations_run else float('nan')
+            # How many times more plain simulations the same precision would take
+            plain_variance = probability * (1.0 - probability) / result['simulations']
+            ci_variance = (ci / self.confidence_z) ** 2
+            reduction = f"{plain_variance / ci_variance:,.0f}x" if ci_variance > 0 else "-"
+            print(f"{self.teams[team_id]['username']:<20} {team_id:<40} {self.original_elos[team_id]:<8.1f} "
+                  f"{probability:<12.5%} +/-{ci:<9.5%} {odds:<16} {plain:<10.4%} {reduction}")
+
+    def get_upset_analysis(self):
+        """Analyze upset frequency and patterns from the streaming upset summary."""
+        summary = self.upset_summary
+        if not summary['total']:
+            return {}
         
         return {
-            'total_upsets': total_upsets,
-            'upsets_per_simulation': total_upsets / self.simulations_run,
-            'upsets_by_round': dict(upsets_by_round),
-            'average_elo_difference': avg_elo_diff,
-            'biggest_upset': max(elo_diffs) if elo_diffs else 0
+            'total_upsets': summary['total'],
+            'upsets_per_simulation': summary['total'] / self.simulations_run,
+            'upsets_by_round': dict(summary['by_round']),
+            'average_elo_difference': summary['elo_diff_sum'] / summary['total'],
+            'biggest_upset': summary['max_elo_diff']
         }
     
     def get_series_analysis(self):
-        """Analyze series statistics from hot simulations."""
-        if not self.series_stats:
+        """Analyze series statistics from hot simulations (streaming series summary)."""
+        summary = self.series_summary
+        if not summary['total']:
             return {}
         
-        # Analyze series lengths
-        series_lengths = [s['games_played'] for s in self.series_stats]
-        series_length_dist = Counter(series_lengths)
-        
-        # Analyze ELO changes during series
-        elo_swings = []
-        for series in self.series_stats:
-            team1_swing = abs(series['final_team1_elo'] - series['initial_team1_elo'])
-            team2_swing = abs(series['final_team2_elo'] - series['initial_team2_elo'])
-            elo_swings.extend([team1_swing, team2_swing])
-        
-        # Analyze comeback frequency (team that was losing 0-3 wins series)
-        comebacks = 0
-        for series in self.series_stats:
-            if series['games_played'] == 7:
-                # Check if either team won 4-3 (potential comeback)
-                if (series['team1_wins'] == 4 and series['team2_wins'] == 3) or \
-                   (series['team2_wins'] == 4 and series['team1_wins'] == 3):
-                    # This could be a comeback, but we'd need game-by-game data to be sure
-                    # For now, just count 7-game series as potential comebacks
-                    comebacks += 1
-        
+        lengths = summary['length_counts']
         return {
-            'total_series': len(self.series_stats),
-            'avg_series_length': sum(series_lengths) / len(series_lengths) if series_lengths else 0,
-            'series_length_distribution': dict(series_length_dist),
-            'avg_elo_swing': sum(elo_swings) / len(elo_swings) if elo_swings else 0,
-            'max_elo_swing': max(elo_swings) if elo_swings else 0,
-            'seven_game_series': series_length_dist.get(7, 0),
-            'sweeps': series_length_dist.get(4, 0),
-            'potential_comebacks': comebacks
+            'total_series': summary['total'],
+            'avg_series_length': sum(length * count for length, count in lengths.items()) / summary['total'],
+            'series_length_distribution': dict(lengths),
+            'avg_elo_swing': summary['elo_swing_sum'] / (2 * summary['total']),
+            'max_elo_swing': summary['max_elo_swing'],
+            'seven_game_series': lengths.get(7, 0),
+            'sweeps': lengths.get(4, 0),
+            # Every 7-game series ends 4-3; without game-by-game data we can't tell
+            # which were real comebacks, so all of them count as potential ones
+            'potential_comebacks': lengths.get(7, 0)
         }
     
     def print_results(self, show_top_n=20):
         """Print comprehensive simulation results."""
         print(f"\n{'='*80}")
-        print(f"TOURNAMENT SIMULATION RESULTS ({self.simulations_run:,} simulations)")
+        if self.exact:
+            print(f"TOURNAMENT ODDS (exact, cold)")
+        else:
+            print(f"TOURNAMENT SIMULATION RESULTS ({self.simulations_run:,} simulations)")
         print(f"{'='*80}")
         
         # Championship odds
         print(f"\nCHAMPIONSHIP ODDS (Top {show_top_n}):")
-        print(f"{'Rank':<4} {'Username':<20} {'Team ID':<40} {'Wins':<8} {'Probability':<12} {'Odds'}")
-        print("-" * 100)
+        ci_label = f"{self.confidence:.0%} CI"
+        print(f"{'Rank':<4} {'Username':<20} {'Team ID':<40} {'Wins':<8} {'Probability':<12} {ci_label:<10} {'Odds'}")
+        print("-" * 110)
         
         championship_odds = self.get_championship_odds(show_top_n)
         for i, result in enumerate(championship_odds, 1):
-            print(f"{i:<4} {result['username']:<20} {result['team_id']:<40} {result['championships']:<8} "
-                  f"{result['probability']:.3%} {result['odds']}")
+            wins = '-' if self.exact else result['championships']
+            ci = f"+/-{result['ci_half_width']:.3%}"
+            print(f"{i:<4} {result['username']:<20} {result['team_id']:<40} {wins:<8} "
+                  f"{result['probability']:<12.3%} {ci:<10} {result['odds']}")
         
         # Round advancement odds for key rounds
         key_rounds = [2, 4, 6, self.max_round] if self.max_round >= 6 else [2, self.max_round]
@@ -551,13 +2634,14 @@ class TournamentSimulator:
         for round_num in key_rounds:
             if round_num in self.round_reaches:
                 print(f"\n{round_names.get(round_num, f'Round {round_num}')} ODDS (Top 10):")
-                print(f"{'Username':<20} {'Team ID':<40} {'Reaches':<8} {'Probability'}")
-                print("-" * 80)
+                print(f"{'Username':<20} {'Team ID':<40} {'Reaches':<8} {'Probability':<12} {ci_label}")
+                print("-" * 90)
                 
                 round_odds = self.get_round_advancement_odds(round_num, 10)
                 for result in round_odds:
-                    print(f"{result['username']:<20} {result['team_id']:<40} {result['round_reaches']:<8} "
-                          f"{result['probability']:.3%}")
+                    reaches = '-' if self.exact else result['round_reaches']
+                    print(f"{result['username']:<20} {result['team_id']:<40} {reaches:<8} "
+                          f"{result['probability']:<12.3%} +/-{result['ci_half_width']:.3%}")
         
         # Series analysis (for hot simulations)
         series_stats = self.get_series_analysis()
@@ -583,45 +2667,461 @@ class TournamentSimulator:
         print(f"  Teams that won at least one championship: {teams_with_championship_chance}")
         print(f"  Competitive balance: {teams_with_championship_chance/total_teams:.1%} of teams have a chance")
     
+    def build_results_frame(self):
+        """
+        Build the per-team results table used by the exports, one column at a
+        time: each counter is scattered into an array by team index in a single
+        pass, then the rows are ordered by championship probability.
+        """
+        num_teams = len(self.team_ids)
+        
+        def counts_array(counter):
+            counts = np.zeros(num_teams, dtype=np.float64)
+            if counter:
+                counts[[self.team_index[team_id] for team_id in counter]] = list(counter.values())
+            return counts
+        
+        def probabilities(counts):
+            return counts / self.simulations_run if self.simulations_run > 0 else np.zeros(num_teams)
+        
+        championships = counts_array(self.championship_wins)
+        columns = {
+            'team_id': self.team_ids,
+            'username': [self.teams[team_id]['username'] for team_id in self.team_ids],
+            'elo': [self.original_elos[team_id] for team_id in self.team_ids],  # Use original ELO rating
+            # no sampled wins in exact mode
+            'championships': [None] * num_teams if self.exact else championships.astype(np.int64),
+            'championship_probability': probabilities(championships),
+            'championship_ci': self.confidence_half_widths(championships),
+        }
+        
+        # Round advancement probabilities (and CI half-widths)
+        round_counts = {round_num: counts_array(self.round_reaches[round_num]) for round_num in sorted(self.rounds.keys())}
+        for round_num, counts in round_counts.items():
+            columns[f'round_{round_num}_prob'] = probabilities(counts)
+        for round_num, counts in round_counts.items():
+            columns[f'round_{round_num}_ci'] = self.confidence_half_widths(counts)
+        
+        # Importance-sampled championship odds of the long shots, blank for the other teams
+        if self.long_shot_odds:
+            long_shot_probabilities = np.full(num_teams, np.nan)
+            long_shot_cis = np.full(num_teams, np.nan)
+            for team_id, result in self.long_shot_odds.items():
+                long_shot_probabilities[self.team_index[team_id]] = result['probabilities'][-1]
+                long_shot_cis[self.team_index[team_id]] = result['ci'][-1]
+            columns['championship_probability_is'] = long_shot_probabilities
+            columns['championship_ci_is'] = long_shot_cis
+        
+        # Sort by championship probability (highest first, ties keep team order)
+        order = np.argsort(-columns['championship_probability'], kind='stable')
+        return pd.DataFrame(columns).take(order).reset_index(drop=True)
+    
+    def build_user_results_frame(self):
+        """
+        Per-user results: the joint probability that any of a user's teams wins
+        a matchup of each round (round_{r}_prob, same meaning as the per-team
+        columns), counted once per tournament. Unlike summing team odds this
+        does not double count users whose teams can meet.
+        """
+        num_users = len(self.usernames)
+        user_index = {username: i for i, username in enumerate(self.usernames)}
+        
+        def counts_array(counter):
+            counts = np.zeros(num_users, dtype=np.float64)
+            if counter:
+                counts[[user_index[username] for username in counter]] = list(counter.values())
+            return counts
+        
+        def probabilities(counts):
+            return counts / self.simulations_run if self.simulations_run > 0 else np.zeros(num_users)
+        
+        max_elo = np.full(num_users, -np.inf)
+        np.maximum.at(max_elo, self.team_users, self.base_elos)
+        championships = counts_array(self.user_round_reaches[self.max_round])
+        columns = {
+            'username': self.usernames,
+            'team_count': np.bincount(self.team_users, minlength=num_users),
+            'max_elo': max_elo,
+            'championship_probability': probabilities(championships),
+            'championship_ci': self.confidence_half_widths(championships),
+        }
+        round_counts = {round_num: counts_array(self.user_round_reaches[round_num]) for round_num in sorted(self.rounds.keys())}
+        for round_num, counts in round_counts.items():
+            columns[f'round_{round_num}_prob'] = probabilities(counts)
+        for round_num, counts in round_counts.items():
+            columns[f'round_{round_num}_ci'] = self.confidence_half_widths(counts)
+        
+        order = np.argsort(-columns['championship_probability'], kind='stable')
+        return pd.DataFrame(columns).take(order).reset_index(drop=True)
+    
+    def export_user_results(self, filename='tournament_user_odds.csv'):
+        """Export the per-user joint odds (see build_user_results_frame) to a CSV file."""
+        df = self.build_user_results_frame()
+        df.to_csv(filename, index=False)
+        print(f"\nUser results exported to {filename}")
+        return df
+    
     def export_results_to_csv(self, filename='tournament_odds.csv'):
         """Export championship odds to a CSV file."""
-        championship_odds = self.get_championship_odds(top_n=None)  # Get all teams
+        df = self.build_results_frame()
+        df.to_csv(filename, index=False)
+        print(f"\nResults exported to {filename}")
+        return df
+    
+    def export_results(self, filename):
+        """
+        Export championship odds in the format given by the file extension:
+        .csv, .parquet, or .arrow/.feather (uncompressed Arrow IPC, which
+        tournament_analysis.py memory-maps). The columnar formats need pyarrow.
+        """
+        suffix = Path(filename).suffix.lower()
+        if suffix not in COLUMNAR_SUFFIXES:
+            return self.export_results_to_csv(filename)
+        
+        try:
+            import pyarrow as pa
+            import pyarrow.feather
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError(f"Writing {suffix} files requires pyarrow (pip install pyarrow)")
+        
+        df = self.build_results_frame()
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if suffix == '.parquet':
+            pyarrow.parquet.write_table(table, filename)
+        else:
+            pyarrow.feather.write_feather(table, filename, compression='uncompressed')
+        print(f"\nResults exported to {filename}")
+        return df
+
+
+def watch_results(simulator, load_matchups, source, interval, top_n=20, export=None):
+    """
+    Poll the bracket (load_matchups() returns a fresh matchups DataFrame) and
+    refresh exact odds after each newly completed matchup.
+    """
+    print(f"\nWatching {source} for completed matchups (every {interval:g}s, Ctrl-C to stop)...")
+    try:
+        while True:
+            time.sleep(interval)
+            changed = simulator.update_results(load_matchups())
+            if len(changed):
+                print(f"\n{len(changed)} matchup result(s) changed; odds refreshed")
+                simulator.print_results(top_n)
+                if export:
+                    export()
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+
+def run_tournament_batch(simulators, num_simulations=10000, hot_simulation=True, engine='numpy',
+                         batch_size=None, workers=1, seed=None):
+    """
+    Simulate several tournaments on one worker pool; simulators maps a key
+    (the tournament id) to its TournamentSimulator. Each tournament gets the
+    blocks run_simulation would plan for the same seed, so its result is
+    identical to a separate run. Blocks are handed out heaviest first, weighted
+    by tournaments x matchups, so the small brackets fill in around the big ones.
+    Every simulator ends up holding its own merged statistics.
+    """
+    if batch_size is None:
+        batch_size = 10000 if engine == 'numpy' else 1000
+    sim_type = "hot (game-by-game)" if hot_simulation else "cold (single matchup)"
+    print(f"Running {num_simulations:,} {sim_type} simulations for each of {len(simulators)} tournaments...")
+    
+    tasks = []
+    for key, simulator in simulators.items():
+        for position, (size, seq) in enumerate(simulator.plan_blocks(num_simulations, batch_size, seed)):
+            tasks.append((size * len(simulator.matchup_ids), key, position, (size, seq, hot_simulation, engine)))
+    tasks.sort(key=lambda task: task[0], reverse=True)
+    
+    states = {key: {} for key in simulators}
+    workers = min(workers, len(tasks))
+    if workers > 1:
+        print(f"Using {workers} worker processes")
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker, initargs=(simulators,)) as pool:
+            futures = [(key, position, pool.submit(_run_batch_worker_block, (key, 'run_block', block)))
+                       for _, key, position, block in tasks]
+            for key, position, future in futures:
+                states[key][position] = future.result()
+    else:
+        for _, key, position, block in tasks:
+            states[key][position] = simulators[key].run_block(*block)
+    
+    # Blocks are merged in order so float sums come out as in a separate run
+    for key, simulator in simulators.items():
+        totals = empty_stats_state()
+        for position in sorted(states[key]):
+            state = states[key][position]
+            simulator.profiler.merge(state.pop('profile', None))
+            merge_stats_states(totals, state)
+        simulator.reset_stats()
+        simulator.load_stats_state(totals)
+    print(f"Simulation complete!")
+
+
+def parse_serve_address(address):
+    """
+    Parse --serve: 'unix:/path/odds.sock' (or any path containing '/') is a
+    Unix socket; 'PORT' or 'HOST:PORT' is HTTP on TCP (host defaults to 127.0.0.1).
+    The service has no authentication, so TCP hosts must be loopback.
+    """
+    if address.startswith('unix:'):
+        return address[len('unix:'):]
+    if '/' in address:
+        return address
+    host, _, port = address.rpartition(':')
+    host = host or '127.0.0.1'
+    if host != 'localhost':
+        try:
+            loopback = ipaddress.ip_address(host).is_loopback
+        except ValueError:
+            loopback = False
+        if not loopback:
+            raise ValueError(f"--serve only listens on localhost or a Unix socket, not {host}")
+    return (host, int(port))
+
+
+class UnixHTTPServer(socketserver.UnixStreamServer):
+    """HTTP over a Unix domain socket (Node: http.request({socketPath, path}))."""
+    
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+
+
+class OddsService:
+    """
+    Resident odds server. Keeps one simulator (compiled bracket and ratings) in
+    memory and answers JSON queries, so a client pays for a dictionary lookup
+    instead of a Python start-up, CSV parse and bracket rebuild per request.
+    
+    GET  /health                      service status
+    GET  /odds?top_n=N                championship odds (top_n=0 for all teams)
+    GET  /rounds?round=R&top_n=N      round advancement odds (all rounds without round)
+    GET  /meetings?team=ID&round=R    odds of team ID facing each opponent (--meetings for sampled runs)
+    POST /elos  {"team_id": elo, ...} replace ratings in memory and rerun
+    POST /refresh                     re-read the inputs now
+    
+    Before every request the input files are checked (mtime/size); when they
+    changed, ratings and completed results are applied in place (a new bracket
+    is rebuilt) and the odds are recomputed. Responses are cached until the
+    odds change. Requests are served one at a time, so the simulator is never
+    shared between threads. Ratings posted to /elos last until the inputs change.
+    With track_results=False completed matchups are never locked in (--ignore-results).
+    """
+    
+    # Matchup columns that define the bracket; results live in winner_id/status
+    BRACKET_COLUMNS = ['id', 'round_number', 'bracket_position', 'parent_matchup_id', 'parent_position']
+    
+    def __init__(self, simulator, build_simulator, load_inputs, input_paths, compute_odds, top_n=20,
+                 track_results=True):
+        """
+        build_simulator(teams, matchups) returns a configured simulator,
+        load_inputs() returns fresh (teams_df, matchups_df), input_paths are
+        the files whose changes trigger a reload and compute_odds(simulator)
+        fills the simulator's statistics.
+        """
+        self.simulator = simulator
+        self.build_simulator = build_simulator
+        self.load_inputs = load_inputs
+        self.input_paths = list(input_paths)
+        self.compute_odds = compute_odds
+        self.top_n = top_n
+        self.track_results = track_results
+        self.input_stamp = self.read_input_stamp()
+        self.version = 1
+        self.stale = simulator.simulations_run == 0
+        self.cache = {}
+    
+    def read_input_stamp(self):
+        stamp = []
+        for path in self.input_paths:
+            try:
+                info = os.stat(path)
+            except FileNotFoundError:
+                stamp.append((path, None))
+                continue
+            stamp.append((path, info.st_mtime_ns, info.st_size))
+        return tuple(stamp)
+    
+    def bracket_changed(self, teams_df, matchups_df):
+        """True when the new inputs describe a different bracket rather than new ratings or results."""
+        simulator = self.simulator
+        if set(teams_df['team_id']) != set(simulator.teams):
+            return True
         
-        # Create dataframe with all team data
-        results_data = []
-        for team_id, team_data in self.teams.items():
-            username = team_data['username']
-            elo = self.original_elos[team_id]  # Use original ELO rating
+        def structure(df):
+            # Later-round team ids are filled in as results arrive; only round 1 seeds the bracket
+            first_round = df['round_number'] == 1
+            columns = df[self.BRACKET_COLUMNS].assign(
+                team1_id=df['team1_id'].where(first_round),
+                team2_id=df['team2_id'].where(first_round),
+            )
+            return columns.sort_values('id', ignore_index=True)
+        
+        return not structure(matchups_df).equals(structure(simulator.matchups_df))
+    
+    def apply_inputs(self, teams_df, matchups_df):
+        """Bring the simulator up to date with fresh inputs; returns True if the odds changed."""
+        if self.bracket_changed(teams_df, matchups_df):
+            print("Bracket changed; rebuilding the simulator")
+            self.simulator = self.build_simulator(teams_df, matchups_df)
+            self.stale = True
+            return True
+        
+        simulator = self.simulator
+        elos = dict(zip(teams_df['team_id'], teams_df['elo']))
+        changed = len(simulator.update_ratings(elos))
+        if self.track_results:
+            changed += len(simulator.update_results(matchups_df))
+        if changed:
+            print(f"Inputs changed ({changed} rating/result update(s))")
+            # Exact odds were already refreshed in place; sampled odds need a rerun
+            self.stale = self.stale or not simulator.exact
+        return changed > 0
+    
+    def refresh(self, force=False):
+        """Reload changed inputs and recompute stale odds before answering a request."""
+        stamp = self.read_input_stamp()
+        if force or stamp != self.input_stamp:
+            self.input_stamp = stamp
+            if self.apply_inputs(*self.load_inputs()):
+                self.invalidate()
+        if self.stale:
+            self.compute_odds(self.simulator)
+            self.stale = False
+            self.invalidate()
+    
+    def invalidate(self):
+        self.version += 1
+        self.cache.clear()
+    
+    def update_elos(self, elos):
+        """Apply posted ratings (team_id -> elo) and rerun; returns the ids that changed."""
+        changed = self.simulator.update_ratings(elos)
+        if changed:
+            self.stale = self.stale or not self.simulator.exact
+            self.invalidate()
+        return changed
+    
+    def summary(self):
+        simulator = self.simulator
+        return {
+            'version': self.version,
+            'teams': len(simulator.team_ids),
+            'matchups': len(simulator.matchup_ids),
+            'locked_matchups': int((simulator.locked_winners >= 0).sum()),
+            'exact': simulator.exact,
+            'simulations_run': simulator.simulations_run,
+            'k_factor': simulator.k_factor,
+        }
+    
+    def query(self, path, params):
+        """Answer a GET; the JSON body is cached per (path, params) until the odds change."""
+        key = (path, tuple(sorted((name, tuple(values)) for name, values in params.items())))
+        body = self.cache.get(key)
+        if body is None:
+            top_n = int(params.get('top_n', [self.top_n])[0])
+            if path == '/health':
+                result = {'status': 'ok', **self.summary()}
+            elif path == '/odds':
+                result = {**self.summary(), 'odds': self.simulator.get_championship_odds(top_n)}
+            elif path == '/rounds':
+                rounds = [int(params['round'][0])] if 'round' in params else sorted(self.simulator.round_reaches)
+                result = {**self.summary(), 'rounds': {
+                    str(round_num): self.simulator.get_round_advancement_odds(round_num, top_n) for round_num in rounds
+                }}
+            elif path == '/meetings':
+                if 'team' not in params:
+                    raise ValueError('/meetings needs a team parameter')
+                round_num = int(params['round'][0]) if 'round' in params else None
+                result = {**self.summary(), 'meetings': self.simulator.get_meeting_odds(
+                    params['team'][0], round_num, top_n)}
+            else:
+                raise LookupError(path)
+            body = json.dumps(result, default=_json_default).encode()
+            self.cache[key] = body
+        return body
+    
+    def handler_class(self):
+        service = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def address_string(self):
+                # Unix socket peers have no (host, port)
+                return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
             
-            # Find championship stats
-            champ_stats = next((odds for odds in championship_odds if odds['team_id'] == team_id), None)
-            championships = champ_stats['championships'] if champ_stats else 0
-            champ_probability = champ_stats['probability'] if champ_stats else 0.0
+            def send_json(self, status, body):
+                if not isinstance(body, bytes):
+                    body = json.dumps(body, default=_json_default).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
             
-            # Get round advancement probabilities
-            round_probs = {}
-            for round_num in sorted(self.rounds.keys()):
-                reaches = self.round_reaches[round_num].get(team_id, 0)
-                round_probs[f'round_{round_num}_prob'] = reaches / self.simulations_run if self.simulations_run > 0 else 0.0
+            def respond(self, answer):
+                try:
+                    self.send_json(200, answer())
+                except LookupError:
+                    self.send_json(404, {'error': f"Unknown endpoint {self.path}"})
+                except ValueError as e:
+                    self.send_json(400, {'error': str(e)})
+                except Exception as e:
+                    self.send_json(500, {'error': str(e)})
             
-            row = {
-                'team_id': team_id,
-                'username': username,
-                'elo': elo,
-                'championships': championships,
-                'championship_probability': champ_probability,
-                **round_probs
-            }
-            results_data.append(row)
-        
-        # Sort by championship probability (highest first)
-        results_data.sort(key=lambda x: x['championship_probability'], reverse=True)
+            def do_GET(self):
+                url = urlsplit(self.path)
+                
+                def answer():
+                    service.refresh()
+                    return service.query(url.path, parse_qs(url.query))
+                self.respond(answer)
+            
+            def do_POST(self):
+                url = urlsplit(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                payload = self.rfile.read(length)
+                
+                def answer():
+                    if url.path == '/refresh':
+                        service.refresh(force=True)
+                        return service.query('/health', {})
+                    if url.path != '/elos':
+                        raise LookupError(url.path)
+                    elos = json.loads(payload or b'{}')
+                    elos = elos.get('elos', elos) if isinstance(elos, dict) else None
+                    if not isinstance(elos, dict):
+                        raise ValueError('Expected a JSON object of team_id: elo')
+                    service.refresh()
+                    changed = service.update_elos(elos)
+                    service.refresh()
+                    return {**service.summary(), 'changed': changed,
+                            'odds': service.simulator.get_championship_odds(service.top_n)}
+                self.respond(answer)
         
-        # Create and save DataFrame
-        df = pd.DataFrame(results_data)
-        df.to_csv(filename, index=False)
-        print(f"\nResults exported to {filename}")
-        return df
+        return Handler
+    
+    def serve_forever(self, address):
+        """Serve on address (see parse_serve_address) until interrupted."""
+        address = parse_serve_address(address)
+        if isinstance(address, str):
+            server = UnixHTTPServer(address, self.handler_class())
+            where = f"unix:{address}"
+        else:
+            server = HTTPServer(address, self.handler_class())
+            where = f"http://{address[0]}:{server.server_address[1]}"
+        print(f"\nServing odds on {where} (Ctrl-C to stop)...")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nStopped serving.")
+        finally:
+            server.server_close()
+            if isinstance(address, str) and os.path.exists(address):
+                os.unlink(address)
 
 
 def main():
@@ -634,29 +3134,198 @@ def main():
                        help='CSV file containing team data (default: playoff_teams.csv)')
     parser.add_argument('--matchups-file', default='playoff_matchups.csv', 
                        help='CSV file containing matchup data (default: playoff_matchups.csv)')
+    parser.add_argument('--tournament', type=str, metavar='ID',
+                       help='Load this tournament directly from the database instead of the CSV exports')
+    parser.add_argument('--db', type=str, default=os.getenv('DB_PATH', './teams.db'),
+                       help='SQLite database used with --tournament or --all-active (default: $DB_PATH or ./teams.db)')
+    parser.add_argument('--all-active', action='store_true',
+                       help='Simulate every active tournament in --db on one worker pool, writing one result file '
+                            'per tournament (see --batch-output)')
+    parser.add_argument('--batch-output', type=str, default='tournament_odds_{tournament_id}.csv',
+                       help='With --all-active: result file per tournament, {tournament_id} filled in; the extension '
+                            'picks the format as for --export (default: tournament_odds_{tournament_id}.csv)')
     parser.add_argument('--top-n', type=int, default=20,
                        help='Number of top teams to show in results (default: 20)')
     parser.add_argument('--export-csv', type=str, metavar='FILENAME',
                        help='Export detailed results to CSV file')
+    parser.add_argument('--export', type=str, metavar='FILENAME',
+                       help='Export detailed results; format from the extension: .csv, .parquet, '
+                            'or .arrow/.feather for Arrow IPC (columnar formats need pyarrow)')
+    parser.add_argument('--export-users', type=str, metavar='FILENAME',
+                       help='Export per-user joint odds (any of the user\'s teams reaching each round) to CSV, '
+                            'for tournament_analysis.py --users-file')
     parser.add_argument('--cold', action='store_true',
                        help='Use cold simulation (single matchup outcome) instead of hot simulation (game-by-game)')
     parser.add_argument('--k-factor', type=int, default=128,
                        help='ELO K-factor for rating updates in hot simulation (default: 128, matches your BASE_K_FACTOR)')
+    parser.add_argument('--exact', action='store_true',
+                       help='Compute exact cold-mode odds by bracket dynamic programming instead of simulating')
+    parser.add_argument('--series-cache', action='store_true',
+                       help='Python engine, hot mode: sample each series in one draw from memoized exact outcome tables')
+    parser.add_argument('--series-cache-size', type=int, default=100000,
+                       help='Maximum number of series outcome tables kept in the LRU cache (default: 100000)')
+    parser.add_argument('--capture-every', type=int, default=0, metavar='N',
+                       help='Python engine: keep raw upset/series records for every Nth tournament (default: off)')
+    parser.add_argument('--precision', type=float, metavar='PP',
+                       help='Run until every top-N championship/round probability is within +/-PP percentage points')
+    parser.add_argument('--max-simulations', type=int, default=1000000,
+                       help='Simulation cap for --precision runs (default: 1000000)')
+    parser.add_argument('--confidence', type=float, default=0.95,
+                       help='Confidence level for reported intervals and --precision (default: 0.95)')
+    parser.add_argument('--meetings', type=str, nargs='?', const='', metavar='TEAM_ID',
+                       help='Count how often each pair of teams meets per round (sampled runs; exact runs need no '
+                            'counting); with TEAM_ID, print that team\'s most likely opponents in each round')
+    parser.add_argument('--long-shots', type=float, nargs='?', const=1650.0, metavar='ELO',
+                       help='Also estimate the championship odds of every team rated below ELO (default: 1650) by '
+                            'importance sampling, which stays precise where plain counts are mostly noise')
+    parser.add_argument('--long-shot-simulations', type=int, default=20000,
+                       help='Importance-sampled simulations per long shot (default: 20000)')
+    parser.add_argument('--long-shot-tilt', type=float, metavar='PROB',
+                       help='Minimum probability with which a long shot wins each of its matchups (cold) or games '
+                            '(hot) in its tilted simulations (default: 1.0 cold, 0.7 hot)')
+    parser.add_argument('--rating-uncertainty', type=float, nargs='?', const=RATING_SD_PER_MATCH, metavar='SD',
+                       help='Draw every team\'s starting ELO per simulation around its rating, with SD / sqrt(matches '
+                            'played) spread (default SD: %.0f, a one-match rating\'s standard error); matches come '
+                            'from the teams file\'s matches_played or wins + losses columns' % RATING_SD_PER_MATCH)
+    parser.add_argument('--ignore-results', action='store_true',
+                       help='Simulate the whole bracket, ignoring winners of completed matchups')
+    parser.add_argument('--watch', type=float, metavar='SECONDS',
+                       help='With --exact: re-read the matchups file every SECONDS and refresh the odds '
+                            'incrementally when results change (Ctrl-C to stop)')
+    parser.add_argument('--serve', type=str, metavar='ADDRESS',
+                       help='Stay resident and answer odds queries over HTTP: PORT or HOST:PORT (loopback hosts only), '
+                            'or unix:/path/odds.sock; inputs are re-read when they change (Ctrl-C to stop)')
+    parser.add_argument('--profile', type=str, metavar='REPORT.json',
+                       help='Write a JSON report of wall/CPU time and allocated blocks per phase and per round, '
+                            'with tournament/series/game counts')
+    parser.add_argument('--cprofile', type=str, metavar='FILE.prof',
+                       help='Capture a cProfile of the simulation run (this process only; use --workers 1)')
+    parser.add_argument('--checkpoint', type=str, metavar='SHARD.json',
+                       help='Write the aggregate state to this shard file every --checkpoint-every blocks; '
+                            'if it exists, resume the run from it')
+    parser.add_argument('--checkpoint-every', type=int, default=10,
+                       help='Blocks between checkpoints (default: 10)')
+    parser.add_argument('--bracket-store', type=str, metavar='BRACKETS.bin',
+                       help='Also save every sampled bracket, one bit per matchup, to this memory-mappable file '
+                            '(read it back with BracketStore)')
+    parser.add_argument('--pickem', type=str, metavar='ENTRIES.csv',
+                       help="Score a bracket pool: one row per pick (entry_id, matchup_id, team_id); reports each "
+                            "entry's expected score, probability of finishing first and finishing places")
+    parser.add_argument('--pickem-points', type=str, metavar='P1,P2,...',
+                       help='Whole points per correct pick in each round (default: 10, doubling every round)')
+    parser.add_argument('--pickem-places', type=int, default=10,
+                       help='Finishing places tracked per entry; worse places are pooled (default: 10)')
+    parser.add_argument('--pickem-brackets', type=str, metavar='BRACKETS.bin',
+                       help='With --pickem: score against brackets saved by --bracket-store instead of simulating')
+    parser.add_argument('--pickem-output', type=str, default='pickem_results.csv',
+                       help='Per-entry pick\'em results CSV (default: pickem_results.csv)')
+    parser.add_argument('--merge-shards', type=str, nargs='+', metavar='SHARD.json',
+                       help='Combine shards from separate runs instead of simulating')
+    parser.add_argument('--shard-output', type=str, metavar='SHARD.json',
+                       help='With --merge-shards: also write the combined shard here')
+    parser.add_argument('--sweep-k', type=str, metavar='K1,K2,...',
+                       help='Parameter sweep: evaluate these K-factors (and --sweep-modes) on common random numbers')
+    parser.add_argument('--sweep-modes', type=str, default='hot,cold',
+                       help='Modes included in a --sweep-k run (default: hot,cold)')
+    parser.add_argument('--sweep-output', type=str, default='tournament_sweep.csv',
+                       help='Combined CSV written by a sweep, keyed by config (default: tournament_sweep.csv)')
+    parser.add_argument('--engine', choices=['numpy', 'python'], default='numpy',
+                       help='Simulation engine: batched numpy (default) or the one-at-a-time python loop')
+    parser.add_argument('--batch-size', type=int, default=None,
+                       help='Tournaments per block/batch (default: 10000 for numpy, 1000 for python)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Worker processes to spread simulation blocks over (default: 1)')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Random seed; results for a seed do not depend on --workers')
     
     args = parser.parse_args()
     
     # Check if files exist
-    if not Path(args.teams_file).exists():
-        print(f"Error: Teams file '{args.teams_file}' not found")
-        sys.exit(1)
+    if args.tournament is None and not args.all_active:
+        if not Path(args.teams_file).exists():
+            print(f"Error: Teams file '{args.teams_file}' not found")
+            sys.exit(1)
+        
+        if not Path(args.matchups_file).exists():
+            print(f"Error: Matchups file '{args.matchups_file}' not found")
+            sys.exit(1)
+    
+    profiler = PhaseProfiler(enabled=args.profile is not None)
+    code_profile = cProfile.Profile() if args.cprofile else None
+    started = time.perf_counter(), time.process_time()
     
-    if not Path(args.matchups_file).exists():
-        print(f"Error: Matchups file '{args.matchups_file}' not found")
+    def write_profiles():
+        if code_profile is not None:
+            code_profile.dump_stats(args.cprofile)
+            print(f"cProfile stats written to {args.cprofile} (python -m pstats {args.cprofile})")
+        if args.profile:
+            profiler.write_report(
+                args.profile,
+                command=sys.argv,
+                simulations_run=simulator.simulations_run,
+                teams=len(simulator.team_ids),
+                matchups=len(simulator.matchup_ids),
+                total_wall_seconds=time.perf_counter() - started[0],
+                total_cpu_seconds=time.process_time() - started[1],  # this process only; workers are in phases
+                series_cache=simulator.series_cache.stats() if simulator.use_series_cache else None,
+            )
+            print(f"Profile report written to {args.profile}")
+    
+    if args.all_active and (args.tournament or args.precision is not None or args.sweep_k or args.merge_shards
+                            or args.checkpoint or args.bracket_store or args.pickem or args.long_shots is not None
+                            or args.serve or args.watch or args.profile or args.cprofile
+                            or args.export or args.export_csv or args.export_users):
+        print("Error: --all-active runs fixed-size or --exact odds for every tournament and writes them to "
+              "--batch-output; it cannot be combined with single-bracket options")
+        sys.exit(1)
+    if args.precision is not None and args.max_simulations <= 0:
+        print("Error: --max-simulations must be positive")
+        sys.exit(1)
+    if args.checkpoint and (args.exact or args.precision is not None or args.sweep_k or args.merge_shards):
+        print("Error: --checkpoint applies to fixed-size simulation runs only")
+        sys.exit(1)
+    if args.bracket_store and (args.exact or args.precision is not None or args.sweep_k or args.merge_shards
+                               or args.checkpoint or args.serve):
+        print("Error: --bracket-store applies to fixed-size simulation runs without --checkpoint or --serve")
+        sys.exit(1)
+    if args.pickem_brackets and not args.pickem:
+        print("Error: --pickem-brackets needs --pickem")
+        sys.exit(1)
+    if args.pickem and (args.exact or args.precision is not None or args.sweep_k or args.merge_shards
+                        or args.checkpoint or args.serve):
+        print("Error: --pickem scores sampled brackets from a fixed-size run or --pickem-brackets")
+        sys.exit(1)
+    if args.rating_uncertainty is not None and args.exact:
+        print("Error: --exact treats ratings as exact; use a simulation run with --rating-uncertainty")
+        sys.exit(1)
+    if args.long_shots is not None and (args.exact or args.sweep_k or args.merge_shards or args.serve):
+        print("Error: --long-shots applies to sampled runs without --sweep-k, --merge-shards or --serve "
+              "(--exact odds need no sampling)")
+        sys.exit(1)
+    if args.watch is not None and (not args.exact or args.ignore_results or args.sweep_k or args.merge_shards
+                                   or args.serve):
+        print("Error: --watch refreshes --exact odds as results come in; it needs --exact and cannot be combined "
+              "with --ignore-results, --sweep-k, --merge-shards or --serve")
+        sys.exit(1)
+    if args.watch is not None and args.watch <= 0:
+        print("Error: --watch needs a positive polling interval")
         sys.exit(1)
+    if args.sweep_k and (args.exact or args.precision is not None or args.cold):
+        print("Error: --sweep-k runs fixed-size simulations for every configuration; choose hot/cold with "
+              "--sweep-modes instead of --cold, and drop --exact/--precision")
+        sys.exit(1)
+    if args.serve and (args.sweep_k or args.merge_shards or args.checkpoint):
+        print("Error: --serve cannot be combined with --sweep-k, --merge-shards or --checkpoint")
+        sys.exit(1)
+    if args.serve:
+        try:
+            parse_serve_address(args.serve)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
     
-    # Initialize and run simulation
-    try:
-        simulator = TournamentSimulator(args.teams_file, args.matchups_file)
+    def build_simulator(teams, matchups):
+        simulator = TournamentSimulator(teams, matchups, profiler=profiler)
         
         # Set K-factor if using hot simulation
         if not args.cold:
@@ -666,14 +3335,173 @@ def main():
 
         print(f"Using K-factor: {simulator.k_factor}")
         
-        # Run simulation (hot by default, cold if --cold flag is used)
-        hot_simulation = not args.cold
-        simulator.run_simulation(args.simulations, args.verbose, hot_simulation)
-        simulator.print_results(args.top_n)
+        simulator.use_series_cache = args.series_cache
+        simulator.capture_every = args.capture_every
+        simulator.confidence = args.confidence
+        simulator.series_cache.maxsize = args.series_cache_size
+        simulator.track_meetings = args.meetings is not None
+        simulator.rating_uncertainty = args.rating_uncertainty
+        if args.rating_uncertainty is not None:
+            unknown = int((simulator.matches_played <= 0).sum())
+            print(f"Sampling starting ELOs with SD {args.rating_uncertainty:.0f} / sqrt(matches played)"
+                  + (f"; {unknown} teams have no recorded matches" if unknown else ""))
+        if args.ignore_results:
+            simulator.clear_results()
+        return simulator
+    
+    # Run simulation (hot by default, cold if --cold flag is used)
+    hot_simulation = not args.cold
+    
+    def compute_odds(simulator, on_winners=None):
+        if args.exact:
+            # Hot series change ELOs along the way, so only cold odds have a closed form
+            print("Computing exact cold-mode odds (no simulation)...")
+            simulator.compute_exact_odds()
+        elif args.precision is not None:
+            simulator.run_until_converged(args.precision / 100.0, args.top_n, args.max_simulations,
+                                          args.verbose, hot_simulation, engine=args.engine,
+                                          batch_size=args.batch_size, workers=args.workers, seed=args.seed)
+        else:
+            simulator.run_simulation(args.simulations, args.verbose, hot_simulation,
+                                     engine=args.engine, batch_size=args.batch_size,
+                                     workers=args.workers, seed=args.seed,
+                                     checkpoint=args.checkpoint, checkpoint_every=args.checkpoint_every,
+                                     bracket_store=args.bracket_store, on_winners=on_winners)
+    
+    # Initialize and run simulation
+    try:
+        if args.all_active:
+            with profiler.phase('load_inputs'):
+                tournaments = load_active_tournaments(args.db)
+                tables = {tournament_id: load_tournament_tables(args.db, tournament_id)
+                          for tournament_id in tournaments['id']}
+            print(f"Found {len(tournaments)} active tournaments in {args.db}")
+            simulators = {}
+            for tournament_id, name in zip(tournaments['id'], tournaments['name']):
+                teams_df, matchups_df = tables[tournament_id]
+                if matchups_df.empty:
+                    print(f"Skipping {name} ({tournament_id}): no bracket yet")
+                    continue
+                print(f"\n{name} ({tournament_id}):")
+                simulators[tournament_id] = build_simulator(teams_df, matchups_df)
+            if not simulators:
+                return
+            
+            with profiler.phase('run'):
+                if args.exact:
+                    print("\nComputing exact cold-mode odds (no simulation)...")
+                    for simulator in simulators.values():
+                        simulator.compute_exact_odds()
+                else:
+                    run_tournament_batch(simulators, args.simulations, hot_simulation, engine=args.engine,
+                                         batch_size=args.batch_size, workers=args.workers, seed=args.seed)
+            
+            names = dict(zip(tournaments['id'], tournaments['name']))
+            for tournament_id, simulator in simulators.items():
+                print(f"\n{'#'*80}\n# {names[tournament_id]} ({tournament_id})\n{'#'*80}")
+                with profiler.phase('report'):
+                    simulator.print_results(args.top_n)
+                    if args.meetings:
+                        simulator.print_meeting_odds(args.meetings, args.top_n)
+                with profiler.phase('export'):
+                    simulator.export_results(args.batch_output.format(tournament_id=tournament_id))
+            return
+        
+        if args.tournament is not None:
+            with profiler.phase('load_inputs'):
+                teams_df, matchups_df = load_tournament_tables(args.db, args.tournament)
+            print(f"Read tournament {args.tournament} from {args.db}")
+            simulator = build_simulator(teams_df, matchups_df)
+            load_inputs = lambda: load_tournament_tables(args.db, args.tournament)
+            load_matchups = lambda: load_tournament_tables(args.db, args.tournament)[1]
+            input_paths = [args.db, args.db + '-wal']
+            source = f"tournament {args.tournament}"
+        else:
+            simulator = build_simulator(args.teams_file, args.matchups_file)
+            load_inputs = lambda: (pd.read_csv(args.teams_file), pd.read_csv(args.matchups_file))
+            load_matchups = lambda: pd.read_csv(args.matchups_file)
+            input_paths = [args.teams_file, args.matchups_file]
+            source = args.matchups_file
+        
+        if args.sweep_k:
+            k_factors = [int(k) for k in args.sweep_k.split(',') if k.strip()]
+            modes = [m.strip() for m in args.sweep_modes.split(',') if m.strip()]
+            with profiler.phase('run'):
+                sweep_df = simulator.run_sweep(k_factors, modes, args.simulations, args.verbose,
+                                               batch_size=args.batch_size or 2000, workers=args.workers, seed=args.seed)
+            simulator.print_sweep_results(sweep_df, args.top_n)
+            with profiler.phase('export'):
+                sweep_df.to_csv(args.sweep_output, index=False)
+            print(f"\nSweep results exported to {args.sweep_output}")
+            write_profiles()
+            return
+        
+        scorer = None
+        if args.pickem:
+            if args.pickem_points:
+                points = [float(p) for p in args.pickem_points.split(',') if p.strip()]
+                round_points = dict(zip(sorted(simulator.rounds), points))
+            else:
+                round_points = {round_num: 10 * 2 ** (round_num - 1) for round_num in simulator.rounds}
+            with profiler.phase('load_inputs'):
+                scorer = simulator.pickem_scorer(pd.read_csv(args.pickem), round_points, args.pickem_places)
+            print(f"Loaded {len(scorer.entry_ids):,} pick'em entries from {args.pickem}")
+        
+        with profiler.phase('run'):
+            if code_profile is not None:
+                code_profile.enable()
+            try:
+                if args.merge_shards:
+                    print(f"Merging {len(args.merge_shards)} shards...")
+                    merged = simulator.merge_shards(args.merge_shards)
+                    if args.shard_output:
+                        write_shard(args.shard_output, merged)
+                        print(f"Combined shard written to {args.shard_output}")
+                elif args.pickem_brackets:
+                    simulator.score_bracket_store(scorer, BracketStore(args.pickem_brackets))
+                else:
+                    compute_odds(simulator, scorer.add if scorer is not None else None)
+                if args.long_shots is not None:
+                    long_shots = [team_id for team_id in simulator.team_ids
+                                  if simulator.original_elos[team_id] < args.long_shots]
+                    simulator.run_long_shot_odds(long_shots, args.long_shot_simulations, hot_simulation,
+                                                 args.long_shot_tilt, batch_size=args.batch_size or 10000,
+                                                 workers=args.workers, seed=args.seed)
+            finally:
+                if code_profile is not None:
+                    code_profile.disable()
+        with profiler.phase('report'):
+            if not args.pickem_brackets:
+                simulator.print_results(args.top_n)
+            if args.meetings:
+                simulator.print_meeting_odds(args.meetings, args.top_n)
+            if args.long_shots is not None:
+                simulator.print_long_shot_odds(args.top_n)
+            if scorer is not None:
+                pickem_df = scorer.results(simulator.confidence_z)
+                simulator.print_pickem_results(pickem_df, args.top_n)
         
         # Export to CSV if requested
-        if args.export_csv:
-            simulator.export_results_to_csv(args.export_csv)
+        def export():
+            with profiler.phase('export'):
+                if args.export_csv:
+                    simulator.export_results_to_csv(args.export_csv)
+                if args.export:
+                    simulator.export_results(args.export)
+                if args.export_users:
+                    simulator.export_user_results(args.export_users)
+                if scorer is not None:
+                    pickem_df.to_csv(args.pickem_output, index=False)
+                    print(f"\nPick'em results exported to {args.pickem_output}")
+        export()
+        write_profiles()
+        
+        if args.serve:
+            service = OddsService(simulator, build_simulator, load_inputs, input_paths, compute_odds, args.top_n,
+                                  track_results=not args.ignore_results)
+            service.serve_forever(args.serve)
+        elif args.watch is not None:
+            watch_results(simulator, load_matchups, source, args.watch, args.top_n, export)
         
     except Exception as e:
         print(f"Error during simulation: {e}")